@@ -1,8 +1,17 @@
 import yfinance as yf
 import psycopg2
+import argparse
+import math
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 from dotenv import load_dotenv
+from etl_lambda.loader import copy_rows
+from etl_lambda.partitions import ensure_partitions, is_partitioned
+from etl_lambda.summaries import refresh_summaries
+from etl_lambda.watermarks import missing_ranges
 
 # Load local .env credentials
 load_dotenv()
@@ -15,60 +24,183 @@ DB_PASS = os.environ.get("DB_PASS")
 
 SYMBOLS = ["TSLA", "NVDA", "AAPL"]
 
-def backfill_symbol(symbol):
-    print(f"⏳ Backfilling last 2 years for {symbol}...")
-    
-    # 1. Fetch 2 years of data
-    stock = yf.Ticker(symbol)
-    df = stock.history(period="2y", interval="1d")
-    
-    if df.empty:
-        print(f"❌ No data found for {symbol}")
-        return
-
-    # 2. Connect to DB
-    try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASS
+# Defaults, all overridable from the command line
+YEARS = 2               # How far back to go
+CHUNK_YEARS = 1         # Size of one unit of work (and of one checkpoint)
+REQUESTS_PER_SECOND = 2.0   # Budget for Yahoo requests across all workers
+MAX_WORKERS = 16
+
+# Rough wall time of one yearly history request; with the budget above it sizes the pool
+EXPECTED_REQUEST_SECONDS = 1.5
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart, across all threads"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+_local = threading.local()
+# Every worker connection, so the run can close them once the pool has drained
+_connections = []
+_connections_lock = threading.Lock()
+
+def get_connection():
+    """One connection per worker thread, opened on first use"""
+    if getattr(_local, "conn", None) is None or _local.conn.closed:
+        _local.conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS)
+        with _connections_lock:
+            _connections.append(_local.conn)
+    return _local.conn
+
+def close_connections():
+    with _connections_lock:
+        for conn in _connections:
+            if not conn.closed:
+                conn.close()
+        _connections.clear()
+
+def ensure_checkpoint_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                symbol VARCHAR(20) NOT NULL,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL,
+                rows_loaded INTEGER,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (symbol, start_date, end_date)
+            );
+        """)
+    conn.commit()
+
+def completed_chunks(conn, symbols):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT symbol, start_date, end_date FROM backfill_checkpoints WHERE symbol = ANY(%s);",
+            (list(symbols),)
         )
-        cursor = conn.cursor()
-        
-        # 3. Insert Loop (Batching would be faster, but this is safer for a simple script)
-        count = 0
-        for date, row in df.iterrows():
-            insert_query = """
-                INSERT INTO daily_prices (symbol, date, open, high, low, close, volume)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (symbol, date) DO NOTHING;
-            """
-            cursor.execute(insert_query, (
-                symbol,
-                date.date(),
-                float(row['Open']),
-                float(row['High']),
-                float(row['Low']),
-                float(row['Close']),
-                int(row['Volume'])
-            ))
-            count += 1
-            
+        return set(cursor.fetchall())
+
+def plan_chunks(symbols, years, chunk_years, today=None):
+    """
+    (symbol, start, end) work units covering at least the last `years`, `end` exclusive.
+    Chunks sit on fixed Jan 1 boundaries (start years divisible by chunk_years), so a chunk
+    keeps the same checkpoint key whenever the backfill runs or resumes.
+    """
+    today = today or date.today()
+    first_year = today.year - years
+    first_year -= first_year % chunk_years
+    return [
+        (symbol, date(year, 1, 1), date(year + chunk_years, 1, 1))
+        for symbol in symbols
+        for year in range(first_year, today.year + 1, chunk_years)
+    ]
+
+def overlaps(ranges, start, end):
+    return any(range_start < end and start < range_end for range_start, range_end in ranges)
+
+def backfill_chunk(symbol, start, end, limiter):
+    """Fetch + bulk load one chunk. Data and checkpoint commit together, so a crash never half-records a chunk."""
+    limiter.wait()
+    df = yf.Ticker(symbol).history(start=start, end=end, interval="1d")
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            count = copy_rows(cursor, symbol, df) if not df.empty else 0
+            # The chunk that contains today is still growing: load it, but don't mark it done
+            if end <= date.today():
+                cursor.execute("""
+                    INSERT INTO backfill_checkpoints (symbol, start_date, end_date, rows_loaded)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (symbol, start_date, end_date) DO NOTHING;
+                """, (symbol, start, end, count))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return count
+
+def run_backfill(symbols, years, chunk_years, rate, max_workers):
+    planned = plan_chunks(symbols, years, chunk_years)
+
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS)
+    ensure_checkpoint_table(conn)
+    done = completed_chunks(conn, symbols)
+    # Chunks loaded some other way (the daily ingest, an older backfill) have no checkpoint;
+    # the watermark/gap scan skips those that daily_prices already covers
+    first_day = min(start for _, start, _ in planned)
+    with conn.cursor() as cursor:
+        missing = missing_ranges(cursor, symbols, first_day)
+        # Maintenance only creates partitions from today forward; without these the
+        # whole backfill would land in daily_prices_default
+        if is_partitioned(cursor):
+            created = ensure_partitions(cursor, first_day, date.today())
+            print(f"🧱 Created partitions: {created or 'none needed'}")
+    conn.commit()
+    conn.close()
+
+    unchecked = [chunk for chunk in planned if chunk not in done]
+    chunks = [(symbol, start, end) for symbol, start, end in unchecked if overlaps(missing[symbol], start, end)]
+    # Enough workers to keep the request budget busy, no more
+    workers = max(1, min(max_workers, math.ceil(rate * EXPECTED_REQUEST_SECONDS)))
+    print(f"📋 {len(chunks)} chunks to fetch ({len(planned) - len(unchecked)} checkpointed, "
+          f"{len(unchecked) - len(chunks)} already in the DB), {workers} workers @ {rate} req/s")
+
+    limiter = RateLimiter(rate)
+    failed = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(backfill_chunk, symbol, start, end, limiter): (symbol, start, end)
+                for symbol, start, end in chunks
+            }
+            for future in as_completed(futures):
+                symbol, start, end = futures[future]
+                try:
+                    count = future.result()
+                    print(f"   ✅ {symbol} {start} → {end}: {count} rows")
+                except Exception as e:
+                    print(f"   ❌ {symbol} {start} → {end}: {e}")
+                    failed.append((symbol, start, end))
+    finally:
+        # The executor has joined its workers here, so none of these is still in use
+        close_connections()
+
+    # One summary refresh per run (not per chunk), from each symbol's earliest new chunk
+    loaded = {}
+    for symbol, start, end in chunks:
+        if (symbol, start, end) not in failed:
+            loaded[symbol] = min(start, loaded.get(symbol, start))
+    if loaded:
+        conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS)
+        with conn.cursor() as cursor:
+            refresh_summaries(cursor, loaded)
         conn.commit()
-        print(f"   ✅ Inserted/Checked {count} days of data for {symbol}.")
-        
-        cursor.close()
         conn.close()
+        print(f"📊 Refreshed summary tables for {len(loaded)} symbols")
 
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    if failed:
+        print(f"\n⚠️ {len(failed)} chunks failed. Re-run the same command to resume them.")
+    return failed
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel, resumable historical backfill")
+    parser.add_argument("--symbols", nargs="+", default=SYMBOLS)
+    parser.add_argument("--years", type=int, default=YEARS)
+    parser.add_argument("--chunk-years", type=int, default=CHUNK_YEARS)
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND, help="Yahoo requests per second")
+    parser.add_argument("--max-workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
     print("🚀 Starting Historical Backfill...")
-    
-    for symbol in SYMBOLS:
-        backfill_symbol(symbol)
-        time.sleep(1) # Be nice to the API
-        
-    print("\n🎉 Backfill Complete! Refresh your dashboard.")
\ No newline at end of file
+    run_backfill(args.symbols, args.years, args.chunk_years, args.rps, args.max_workers)
+    print("\n🎉 Backfill Complete! Refresh your dashboard.")
@@ -0,0 +1,62 @@
+"""
+Loader benchmark: row-by-row INSERT vs COPY + set-based merge.
+
+Runs against the DB in your .env and rolls every transaction back,
+so nothing is left behind in daily_prices.
+
+    python -m benchmarks.bench_loader
+"""
+import os
+import time
+import numpy as np
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+
+from etl_lambda.loader import insert_rows, copy_rows
+
+load_dotenv()
+
+DB_HOST = os.environ.get("DB_HOST")
+DB_NAME = os.environ.get("DB_NAME")
+DB_USER = os.environ.get("DB_USER")
+DB_PASS = os.environ.get("DB_PASS")
+
+# Trading days per payload
+PAYLOADS = {"5d": 5, "2y": 504, "10y": 2520}
+REPEATS = 3
+
+def make_history(days):
+    """Synthetic yfinance-shaped daily history ending today"""
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days, tz="America/New_York")
+    close = 100 + np.cumsum(np.random.normal(0, 1, days))
+    return pd.DataFrame({
+        "Open": close + np.random.normal(0, 0.5, days),
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": np.random.randint(1_000_000, 50_000_000, days),
+    }, index=index)
+
+def time_load(conn, loader, df):
+    best = float("inf")
+    for _ in range(REPEATS):
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        loader(cursor, "BENCH", df)
+        best = min(best, time.perf_counter() - start)
+        cursor.close()
+        conn.rollback()
+    return best
+
+if __name__ == "__main__":
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS)
+
+    print(f"{'payload':>8} {'rows':>6} {'insert rows/s':>14} {'copy rows/s':>12} {'speedup':>8}")
+    for name, days in PAYLOADS.items():
+        df = make_history(days)
+        insert_s = time_load(conn, insert_rows, df)
+        copy_s = time_load(conn, copy_rows, df)
+        print(f"{name:>8} {days:>6} {days / insert_s:>14,.0f} {days / copy_s:>12,.0f} {insert_s / copy_s:>7.1f}x")
+
+    conn.close()
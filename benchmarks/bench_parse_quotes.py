@@ -0,0 +1,159 @@
+"""
+Chart-response parsing benchmark: yfinance.utils.parse_quotes/parse_actions (typed NumPy
+columns, one frame build, sort only when needed) against the list-based implementation
+they replaced, which is kept here as the baseline.
+
+Uses synthetic chart results, so it runs offline: a 1-day and an 8-day 1-minute
+history, a 10-year daily history with dividends and splits, and a 1-day history with
+fractional volumes (as crypto pairs report). Each fast-path result is checked
+against the baseline before timing.
+
+    python -m benchmarks.bench_parse_quotes
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from yfinance import utils
+
+REPEATS = 50
+
+def make_chart_result(timestamps, dividends=0, splits=0, fractional_volume=False, seed=0):
+    """A decoded /v8/finance/chart result: Python lists with Yahoo's None gaps"""
+    rng = np.random.default_rng(seed)
+    n = len(timestamps)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    if fractional_volume:
+        volume = [round(float(v), 6) for v in rng.uniform(0.001, 50, n)]
+    else:
+        volume = [int(v) for v in rng.integers(100, 100_000, n)]
+
+    def column(values):
+        values = [round(float(v), 4) for v in values]
+        for i in rng.choice(n, max(1, n // 500), replace=False):
+            values[i] = None
+        return values
+
+    events = {"dividends": {}, "splits": {}}
+    for ts in rng.choice(timestamps, dividends, replace=False):
+        events["dividends"][str(ts)] = {"amount": 0.25, "date": int(ts)}
+    for ts in rng.choice(timestamps, splits, replace=False):
+        events["splits"][str(ts)] = {"date": int(ts), "numerator": 2.0, "denominator": 1.0, "splitRatio": "2:1"}
+    return {
+        "timestamp": [int(ts) for ts in timestamps],
+        "indicators": {
+            "quote": [{
+                "open": column(close + 0.05), "high": column(close + 0.2), "low": column(close - 0.2),
+                "close": column(close), "volume": volume,
+            }],
+            "adjclose": [{"adjclose": column(close * 0.98)}],
+        },
+        "events": events,
+    }
+
+def intraday_timestamps(days):
+    """1-minute bars, 390 per session"""
+    sessions = pd.bdate_range(end="2025-12-31", periods=days)
+    opens = (sessions + pd.Timedelta(hours=14, minutes=30)).as_unit("s").asi8
+    return (opens[:, None] + np.arange(390) * 60).ravel()
+
+def daily_timestamps(years):
+    return pd.bdate_range(end="2025-12-31", periods=years * 252).as_unit("s").asi8 + 14 * 3600 + 1800
+
+# --- Baseline: the parse_quotes/parse_actions this benchmark replaced ---
+
+def parse_quotes_baseline(data):
+    timestamps = data["timestamp"]
+    ohlc = data["indicators"]["quote"][0]
+    volumes = ohlc["volume"]
+    opens = ohlc["open"]
+    closes = ohlc["close"]
+    lows = ohlc["low"]
+    highs = ohlc["high"]
+
+    adjclose = closes
+    if "adjclose" in data["indicators"]:
+        adjclose = data["indicators"]["adjclose"][0]["adjclose"]
+
+    quotes = pd.DataFrame({"Open": opens,
+                           "High": highs,
+                           "Low": lows,
+                           "Close": closes,
+                           "Adj Close": adjclose,
+                           "Volume": volumes})
+
+    quotes.index = pd.to_datetime(timestamps, unit="s")
+    quotes.sort_index(inplace=True)
+
+    return quotes
+
+def parse_actions_baseline(data):
+    dividends = None
+    capital_gains = None
+    splits = None
+
+    if "events" in data:
+        if "dividends" in data["events"] and len(data["events"]['dividends']) > 0:
+            dividends = pd.DataFrame(
+                data=list(data["events"]["dividends"].values()))
+            dividends.set_index("date", inplace=True)
+            dividends.index = pd.to_datetime(dividends.index, unit="s")
+            dividends.sort_index(inplace=True)
+            if 'currency' in dividends.columns and (dividends['currency'] == '').all():
+                # Currency column useless, drop it.
+                dividends = dividends.drop('currency', axis=1)
+            dividends = dividends.rename(columns={'amount': 'Dividends'})
+
+        if "capitalGains" in data["events"] and len(data["events"]['capitalGains']) > 0:
+            capital_gains = pd.DataFrame(
+                data=list(data["events"]["capitalGains"].values()))
+            capital_gains.set_index("date", inplace=True)
+            capital_gains.index = pd.to_datetime(capital_gains.index, unit="s")
+            capital_gains.sort_index(inplace=True)
+            capital_gains.columns = ["Capital Gains"]
+
+        if "splits" in data["events"] and len(data["events"]['splits']) > 0:
+            splits = pd.DataFrame(
+                data=list(data["events"]["splits"].values()))
+            splits.set_index("date", inplace=True)
+            splits.index = pd.to_datetime(splits.index, unit="s")
+            splits.sort_index(inplace=True)
+            splits["Stock Splits"] = splits["numerator"] / splits["denominator"]
+            splits = splits[["Stock Splits"]]
+
+    if dividends is None:
+        dividends = pd.DataFrame(
+            columns=["Dividends"], index=pd.DatetimeIndex([]))
+    if capital_gains is None:
+        capital_gains = pd.DataFrame(
+            columns=["Capital Gains"], index=pd.DatetimeIndex([]))
+    if splits is None:
+        splits = pd.DataFrame(
+            columns=["Stock Splits"], index=pd.DatetimeIndex([]))
+
+    return dividends, splits, capital_gains
+
+def time_per_call(fn, data):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(data)
+    return (time.perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    cases = {
+        "1m x 1 day": make_chart_result(intraday_timestamps(1)),
+        "1m x 8 days": make_chart_result(intraday_timestamps(8)),
+        "1d x 10 years": make_chart_result(daily_timestamps(10), dividends=40, splits=2),
+        "1m fractional": make_chart_result(intraday_timestamps(1), fractional_volume=True),
+    }
+    print(f"{'':>14}  {'rows':>6}  {'baseline':>10}  {'fast path':>10}  {'speedup':>7}   (parse_quotes + parse_actions)")
+    for name, data in cases.items():
+        fast = utils.parse_quotes(data)
+        baseline = parse_quotes_baseline(data)
+        pd.testing.assert_frame_equal(fast, baseline, check_dtype=False)
+        for fast_events, baseline_events in zip(utils.parse_actions(data), parse_actions_baseline(data)):
+            pd.testing.assert_frame_equal(fast_events, baseline_events)
+
+        baseline_s = time_per_call(lambda d: (parse_quotes_baseline(d), parse_actions_baseline(d)), data)
+        fast_s = time_per_call(lambda d: (utils.parse_quotes(d), utils.parse_actions(d)), data)
+        print(f"{name:>14}  {len(fast):>6,}  {baseline_s * 1e3:>8.2f}ms  {fast_s * 1e3:>8.2f}ms  {baseline_s / fast_s:>6.1f}x")
@@ -0,0 +1,60 @@
+"""
+Raw-zone format benchmark: object size and decode time, JSON vs Parquet.
+
+Uses synthetic yfinance-shaped frames, so it runs offline:
+a 10-year daily history and a 60-day 1-minute history.
+
+    python -m benchmarks.bench_raw_format
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from etl_lambda.raw_zone import FORMATS, encode_frame, decode_frame
+
+REPEATS = 5
+
+def make_history(index):
+    n = len(index)
+    close = 100 + np.cumsum(np.random.normal(0, 0.1, n))
+    return pd.DataFrame({
+        "Open": close + np.random.normal(0, 0.05, n),
+        "High": close + 0.1,
+        "Low": close - 0.1,
+        "Close": close,
+        "Volume": np.random.randint(1_000, 5_000_000, n),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+def daily_10y():
+    return make_history(pd.bdate_range(end="2025-12-31", periods=2520, tz="America/New_York"))
+
+def minute_60d():
+    # 390 regular-session minutes per trading day
+    days = pd.bdate_range(end="2025-12-31", periods=60, tz="America/New_York")
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=390, freq="1min")
+        for day in days
+    ]))
+    return make_history(index)
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == "__main__":
+    print(f"{'history':>12} {'rows':>7} {'format':>8} {'size KB':>9} {'encode ms':>10} {'decode ms':>10}")
+    for name, make in [("10y daily", daily_10y), ("60d 1m", minute_60d)]:
+        df = make()
+        for fmt in FORMATS:
+            body, extension, _ = encode_frame(df, fmt)
+            raw = body.encode("utf-8") if isinstance(body, str) else body
+            encode_s = best_of(lambda: encode_frame(df, fmt))
+            decode_s = best_of(lambda: decode_frame(raw, f"bench{extension}"))
+            print(f"{name:>12} {len(df):>7} {fmt:>8} {len(raw) / 1024:>9,.0f} "
+                  f"{encode_s * 1000:>10.1f} {decode_s * 1000:>10.1f}")
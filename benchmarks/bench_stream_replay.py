@@ -0,0 +1,213 @@
+"""
+Live stream capture/replay: throughput of the yfinance.live decoder plus our tick handler,
+without a Yahoo connection.
+
+Capture raw frames once (JSON lines: seconds since start + the frame exactly as received):
+
+    python -m benchmarks.bench_stream_replay capture frames.jsonl --seconds 300 --symbols TSLA NVDA AAPL
+
+Replay them, or a synthetic session when no file is given:
+
+    python -m benchmarks.bench_stream_replay replay [frames.jsonl] [--via socket] [--paced] [--trace-alloc]
+
+  --via direct  BaseWebSocket._decode_message + TickStreamer.on_message in a loop (default)
+  --via socket  a local websocket server replays the frames to AsyncWebSocket.listen,
+                so the json/base64/protobuf path is exactly the live one
+  --paced       keep the recorded gaps between frames instead of sending flat out
+  --trace-alloc a separate tracemalloc pass: peak/retained memory and the top allocation sites
+
+Reports messages/sec and p50/p99 per-message latency: decode + handler in direct mode,
+handler only in socket mode (the decode happens inside listen). With --via socket --paced
+it also reports end-to-end latency, server send to handler return; flat out that number
+is only queueing.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+from yfinance.live import AsyncWebSocket, BaseWebSocket
+from yfinance.pricing_pb2 import PricingData
+
+from stream_ticks import SYMBOLS, TickStreamer
+
+YAHOO_STREAM_URL = "wss://streamer.finance.yahoo.com/?version=2"
+
+# Yahoo drops subscriptions that aren't renewed (AsyncWebSocket does the same every 15s)
+RESUBSCRIBE_SECONDS = 15
+
+# tracemalloc slows everything ~10x; its pass replays only the head of the stream
+ALLOC_TRACE_FRAMES = 10_000
+
+def read_frames(path):
+    """[(seconds since capture start, raw frame)]"""
+    with open(path) as f:
+        return [(record["t"], record["frame"]) for record in map(json.loads, f)]
+
+def synthetic_frames(symbols=50, seconds=60, per_second=1000, seed=0):
+    """Yahoo-shaped frames: {"type": "pricing", "message": base64(PricingData)}"""
+    rng = random.Random(seed)
+    prices = {f"SYM{i:02d}": 100.0 for i in range(symbols)}
+    volumes = dict.fromkeys(prices, 1_000_000)
+    start_ms = int(time.time() * 1000)
+    frames = []
+    for i in range(seconds * per_second):
+        symbol = rng.choice(list(prices))
+        prices[symbol] *= 1 + rng.gauss(0, 0.0005)
+        size = rng.randint(1, 500)
+        volumes[symbol] += size
+        t = i / per_second
+        message = PricingData(
+            id=symbol, price=prices[symbol], time=start_ms + int(t * 1000), exchange="NMS",
+            quote_type=8, market_hours=1, day_volume=volumes[symbol], last_size=size,
+            change=0.0, change_percent=0.0, price_hint=2,
+        )
+        encoded = base64.b64encode(message.SerializeToString()).decode("ascii")
+        frames.append((t, json.dumps({"type": "pricing", "message": encoded})))
+    return frames
+
+async def capture(path, symbols, seconds):
+    async with connect(YAHOO_STREAM_URL) as ws:
+        start = last_subscribe = time.monotonic()
+        await ws.send(json.dumps({"subscribe": symbols}))
+        count = 0
+        with open(path, "w") as f:
+            while (remaining := seconds - (time.monotonic() - start)) > 0:
+                if time.monotonic() - last_subscribe >= RESUBSCRIBE_SECONDS:
+                    await ws.send(json.dumps({"subscribe": symbols}))
+                    last_subscribe = time.monotonic()
+                try:
+                    frame = await asyncio.wait_for(ws.recv(), timeout=min(remaining, RESUBSCRIBE_SECONDS))
+                except asyncio.TimeoutError:
+                    continue
+                f.write(json.dumps({"t": round(time.monotonic() - start, 6), "frame": frame}) + "\n")
+                count += 1
+    print(f"📼 Captured {count:,} frames in {seconds}s to {path}")
+
+class Handler:
+    """The downstream work per message: TickStreamer's handler, with batches taken (not written) as they fill"""
+    def __init__(self):
+        self.streamer = TickStreamer()
+
+    def __call__(self, message):
+        self.streamer.on_message(message)
+        if self.streamer.full.is_set():
+            self.streamer.take_batch()
+
+def replay_direct(frames, paced):
+    decoder = BaseWebSocket(verbose=False)
+    handler = Handler()
+    latencies = np.empty(len(frames))
+    start = time.perf_counter()
+    for i, (t, frame) in enumerate(frames):
+        if paced:
+            time.sleep(max(0.0, t - (time.perf_counter() - start)))
+        received = time.perf_counter()
+        # Same steps as AsyncWebSocket.listen
+        handler(decoder._decode_message(json.loads(frame).get("message", "")))
+        latencies[i] = time.perf_counter() - received
+    return time.perf_counter() - start, latencies, None
+
+async def replay_socket(frames, paced):
+    sent = deque()
+    handler = Handler()
+    # Preallocated, so the harness's own bookkeeping stays out of the allocation report
+    latencies = np.empty(len(frames))
+    end_to_end = np.empty(len(frames))
+    received = 0
+    done = asyncio.Event()
+
+    async def stand_in(connection):
+        """Local stand-in for Yahoo's streamer: ignores subscriptions, sends the frames"""
+        start = time.perf_counter()
+        for t, frame in frames:
+            if paced:
+                await asyncio.sleep(max(0.0, t - (time.perf_counter() - start)))
+            sent.append(time.perf_counter())
+            await connection.send(frame)
+        await done.wait()
+
+    def on_message(message):
+        nonlocal received
+        called = time.perf_counter()
+        handler(message)
+        returned = time.perf_counter()
+        latencies[received] = returned - called
+        end_to_end[received] = returned - sent.popleft()
+        received += 1
+        if received == len(frames):
+            done.set()
+
+    async with serve(stand_in, "localhost", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncWebSocket(url=f"ws://localhost:{port}", verbose=False)
+        start = time.perf_counter()
+        await client.subscribe(SYMBOLS)
+        listener = asyncio.create_task(client.listen(on_message))
+        await done.wait()
+        elapsed = time.perf_counter() - start
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+    return elapsed, latencies, end_to_end
+
+def run_replay(frames, via, paced):
+    if via == "socket":
+        return asyncio.run(replay_socket(frames, paced))
+    return replay_direct(frames, paced)
+
+def report_allocations(frames, via, paced, top=8):
+    frames = frames[:ALLOC_TRACE_FRAMES]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    run_replay(frames, via, paced)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")
+    retained = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    print(f"\n🧮 tracemalloc: peak {peak / 1024:,.0f} KB, retained {retained / 1024:,.0f} KB "
+          f"in {blocks:,} blocks ({blocks / len(frames):.2f} per message, first {len(frames):,} frames)")
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        print(f"   {stat.size_diff / 1024:>9,.1f} KB {stat.count_diff:>9,} blocks  {frame.filename}:{frame.lineno}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture/replay harness for the live stream decoder")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture_args = commands.add_parser("capture", help="record raw frames from Yahoo")
+    capture_args.add_argument("path")
+    capture_args.add_argument("--seconds", type=int, default=300)
+    capture_args.add_argument("--symbols", nargs="+", default=SYMBOLS)
+
+    replay_args = commands.add_parser("replay", help="replay recorded (or synthetic) frames offline")
+    replay_args.add_argument("path", nargs="?")
+    replay_args.add_argument("--via", choices=["direct", "socket"], default="direct")
+    replay_args.add_argument("--paced", action="store_true")
+    replay_args.add_argument("--trace-alloc", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        asyncio.run(capture(args.path, args.symbols, args.seconds))
+    else:
+        frames = read_frames(args.path) if args.path else synthetic_frames()
+        print(f"Replaying {len(frames):,} frames via {args.via} ({'recorded pacing' if args.paced else 'max speed'})")
+
+        elapsed, latencies, end_to_end = run_replay(frames, args.via, args.paced)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        print(f"   {len(frames) / elapsed:>10,.0f} msgs/s   p50 {p50:,.1f} µs   p99 {p99:,.1f} µs   ({elapsed:.2f} s)")
+        if end_to_end is not None and args.paced:
+            p50, p99 = np.percentile(end_to_end, [50, 99]) * 1e6
+            print(f"   end to end:       p50 {p50:,.1f} µs   p99 {p99:,.1f} µs")
+
+        if args.trace_alloc:
+            report_allocations(frames, args.via, args.paced)
@@ -0,0 +1,106 @@
+"""
+Tick aggregation benchmark: sustained ticks/sec through TickAggregator, replaying a
+recorded tick stream the way stream_ticks.py feeds it (one add() per message, a
+fold + drain every flush), against a per-message pandas baseline.
+
+Replays a CSV of symbol,ts_ms,price,volume ticks, e.g. exported from the ticks table:
+
+    \\copy (SELECT symbol, (extract(epoch FROM ts) * 1000)::bigint, price, last_size FROM ticks ORDER BY ts) TO 'ticks.csv' CSV
+
+or, without one, a synthetic 1-hour session for 50 symbols (~1M ticks), so it runs offline.
+Before timing, it checks out-of-order ticks against hand-built expected bars.
+
+    python -m benchmarks.bench_tick_aggregator [ticks.csv]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from tick_aggregator import TickAggregator
+
+# Ticks between flushes, as in stream_ticks.FLUSH_MAX_TICKS
+FLUSH_TICKS = 500
+
+# The pandas baseline is far slower; it only replays the head of the stream
+BASELINE_TICKS = 20_000
+
+def synthetic_session(symbols=50, seconds=3600, ticks_per_second=300, seed=0):
+    rng = np.random.default_rng(seed)
+    n = seconds * ticks_per_second
+    start = int(pd.Timestamp("2025-12-31 14:30", tz="UTC").timestamp() * 1000)
+    ts = start + np.sort(rng.integers(0, seconds * 1000, n))
+    codes = rng.integers(0, symbols, n)
+    price = 100 + rng.normal(0, 0.02, (symbols, n)).cumsum(axis=1)[codes, np.arange(n)]
+    return pd.DataFrame({
+        "symbol": np.array([f"SYM{i:02d}" for i in range(symbols)])[codes],
+        "ts": ts,
+        "price": price,
+        "volume": rng.integers(1, 500, n).astype(float),
+    })
+
+def load_replay(path):
+    return pd.read_csv(path, names=["symbol", "ts", "price", "volume"])
+
+def check_out_of_order():
+    """A late tick (older than the open bar, newer than anything closed) keeps the open bar intact"""
+    def bars(batches):
+        aggregator = TickAggregator({"1m": 1})
+        for batch in batches:
+            for minute, price in batch:
+                aggregator.add("X", minute * 60_000, price, 1)
+            aggregator.fold()
+        aggregator.close_expired(10**12)
+        closed = aggregator.drain().sort_values("ts")
+        return [(int(ts.timestamp() // 60), row.open, row.close, row.volume)
+                for ts, row in zip(closed["ts"], closed.itertuples())], aggregator.late_ticks
+
+    expected = [(8, 1.0, 1.0, 1), (9, 3.0, 3.0, 1), (10, 2.0, 4.0, 2)]
+    # Late tick in a later fold than the open bar
+    assert bars([[(8, 1.0), (10, 2.0)], [(9, 3.0), (10, 4.0)]]) == (expected, 0)
+    # Late tick in the same fold as more ticks for the open bar
+    assert bars([[(8, 1.0), (10, 2.0)], [(10, 4.0), (9, 3.0)]]) == (expected, 0)
+    # A tick for a bar that already closed is dropped and counted
+    assert bars([[(8, 1.0), (10, 2.0)], [(9, 3.0), (10, 4.0)], [(8, 5.0)]]) == (expected, 1)
+
+def replay_engine(ticks):
+    # Materialized up front: the recorded stream's own iteration cost isn't the engine's
+    messages = list(ticks.itertuples(index=False, name=None))
+    aggregator = TickAggregator()
+    bars = 0
+    start = time.perf_counter()
+    for i, (symbol, ts, price, volume) in enumerate(messages, 1):
+        aggregator.add(symbol, ts, price, volume)
+        if i % FLUSH_TICKS == 0:
+            aggregator.fold()
+            aggregator.close_expired()
+            bars += len(aggregator.drain()) + len(aggregator.open_bars())
+    aggregator.fold()
+    aggregator.close_expired(int(ticks["ts"].iloc[-1]) + 10**9)
+    bars += len(aggregator.drain())
+    return time.perf_counter() - start, bars, aggregator.late_ticks
+
+def replay_pandas(ticks):
+    """The approach the engine replaces: append each tick to a frame, resample on flush"""
+    messages = list(ticks.itertuples(index=False, name=None))
+    frame = ticks.iloc[:0]
+    start = time.perf_counter()
+    for i, row in enumerate(messages, 1):
+        frame = pd.concat([frame, pd.DataFrame([row], columns=frame.columns)], ignore_index=True)
+        if i % FLUSH_TICKS == 0:
+            indexed = frame.assign(ts=pd.to_datetime(frame["ts"].astype("int64"), unit="ms", utc=True)).set_index("ts")
+            for rule in ["1min", "5min", "15min"]:
+                indexed.groupby("symbol")["price"].resample(rule).ohlc()
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    check_out_of_order()
+    ticks = load_replay(sys.argv[1]) if len(sys.argv) > 1 else synthetic_session()
+    print(f"Replaying {len(ticks):,} ticks, {ticks['symbol'].nunique()} symbols, flush every {FLUSH_TICKS}")
+
+    seconds, bars, late = replay_engine(ticks)
+    print(f"{'engine':>8}: {len(ticks) / seconds:>12,.0f} ticks/s  ({seconds:.2f} s, {bars:,} bar rows, {late} late ticks)")
+
+    head = ticks.head(BASELINE_TICKS)
+    seconds = replay_pandas(head)
+    print(f"{'pandas':>8}: {len(head) / seconds:>12,.0f} ticks/s  (first {len(head):,} ticks)")
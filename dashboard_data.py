@@ -0,0 +1,456 @@
+import streamlit as st
+import pandas as pd
+import psycopg2
+import boto3
+import json
+import os
+import select
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import date, timedelta
+from psycopg2.pool import ThreadedConnectionPool
+from dotenv import load_dotenv
+from downsample import choose_ohlc_rule, resample_ohlc
+
+# Shared data layer for the dashboard pages (dashboard.py, pages/01_US_Tech_Dashboard.py)
+
+# Load .env as a backup
+load_dotenv()
+
+# Query results are shared across reruns, sessions and viewers for at most this long.
+# Ingest runs on a schedule, so nothing new can show up between runs anyway.
+CACHE_TTL_SECONDS = int(os.environ.get("DASHBOARD_CACHE_TTL", "900"))
+
+# How often we ask the DB whether new data landed (one tiny query for everyone)
+VERSION_CHECK_SECONDS = 60
+
+DEFAULT_SYMBOLS = ["TSLA", "NVDA", "AAPL"]
+
+# Secrets Manager is asked again at most this often (picks up rotated passwords)
+SECRET_REFRESH_SECONDS = 3600
+
+# One pool per server process, shared by every session. Callers wait for a free slot.
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = int(os.environ.get("DB_POOL_MAX", "10"))
+
+# Connections idle longer than this get a SELECT 1 before they're handed out
+HEALTH_CHECK_IDLE_SECONDS = 30
+
+# Processor NOTIFYs this channel after each committed load
+NOTIFY_CHANNEL = "prices_updated"
+
+# How often the live view checks the listener for news (no DB round trip unless something changed)
+LIVE_POLL_SECONDS = 5
+
+# created_at is the inserting transaction's start time, so a row can commit after
+# rows with later timestamps. Re-reading a little overlap (deduped on merge) covers that.
+LIVE_OVERLAP = timedelta(minutes=15)
+
+# Rows per page in the raw-records table
+RECORDS_PAGE_SIZE = 50
+
+# Candle sizes (downsample.OHLC_RULES labels) the processor keeps pre-aggregated in ohlc_rollups
+ROLLUP_PERIODS = {"Weekly": "week", "Monthly": "month", "Quarterly": "quarter", "Yearly": "year"}
+
+# Range selector options -> days of history (None = everything)
+RANGE_OPTIONS = {"1M": 30, "6M": 182, "1Y": 365, "5Y": 1826, "Max": None}
+
+# --- SECURITY: Fetch Credentials ---
+_secret_lock = threading.Lock()
+_secret_cache = {"credentials": None, "fetched_at": 0.0}
+
+def _fetch_credentials():
+    """
+    Tries to get creds from AWS Secrets Manager first.
+    Falls back to local .env file if AWS fails.
+    """
+    # 1. Try AWS Secrets Manager
+    try:
+        session = boto3.session.Session()
+        client = session.client(service_name='secretsmanager', region_name='us-east-1')
+        secret_value = client.get_secret_value(SecretId='tadawul-secrets')
+        secret = json.loads(secret_value['SecretString'])
+        return secret['DB_HOST'], secret['DB_NAME'], secret['DB_USER'], secret['DB_PASS']
+
+    except Exception:
+        # 2. Fallback to .env (for local testing)
+        return (
+            os.environ.get("DB_HOST"),
+            os.environ.get("DB_NAME"),
+            os.environ.get("DB_USER"),
+            os.environ.get("DB_PASS")
+        )
+
+def _cached_credentials(refresh=False):
+    """
+    (host, name, user, password), kept in memory for SECRET_REFRESH_SECONDS. Only a complete
+    set is cached: after a failed lookup the previous credentials stay in use, and the
+    next call tries again.
+    """
+    with _secret_lock:
+        if (refresh or _secret_cache["credentials"] is None
+                or time.monotonic() - _secret_cache["fetched_at"] > SECRET_REFRESH_SECONDS):
+            credentials = _fetch_credentials()
+            if all(credentials):
+                _secret_cache["credentials"] = credentials
+                _secret_cache["fetched_at"] = time.monotonic()
+            elif _secret_cache["credentials"] is None:
+                return credentials
+        return _secret_cache["credentials"]
+
+def get_db_credentials():
+    """Credentials for the current script run; stops the page when there are none"""
+    credentials = _cached_credentials()
+    if not credentials[3]:
+        st.error("❌ Critical Error: No credentials found in AWS Secrets or .env")
+        st.stop()
+    return credentials
+
+# --- POOL: shared connections ---
+class _Pool:
+    """ThreadedConnectionPool that blocks (instead of raising) when every connection is busy"""
+    def __init__(self, host, name, user, password):
+        self.pool = ThreadedConnectionPool(
+            POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS,
+            host=host, database=name, user=user, password=password
+        )
+        self.slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+        self.last_used = {}
+        # Evicted from st.cache_resource (rotated password): close its connections once the
+        # last session holding it has checked in, instead of leaving them open on RDS
+        weakref.finalize(self, self.pool.closeall)
+
+    def checkout(self):
+        self.slots.acquire()
+        try:
+            # After a failover every idle connection is dead, so the one handed out in place
+            # of a broken one gets checked too; once the idle ones are gone, a fresh one opens
+            for _ in range(POOL_MAX_CONNECTIONS + 1):
+                conn = self.pool.getconn()
+                if not conn.closed and self._is_healthy(conn):
+                    return conn
+                self.last_used.pop(id(conn), None)
+                self.pool.putconn(conn, close=True)
+            raise psycopg2.OperationalError("No database connection passed its health check")
+        except Exception:
+            self.slots.release()
+            raise
+
+    def checkin(self, conn, broken=False):
+        try:
+            if not broken and not conn.closed:
+                conn.rollback()  # Reads still open a transaction; hand it back idle
+                self.last_used[id(conn)] = time.monotonic()
+            else:
+                self.last_used.pop(id(conn), None)
+            self.pool.putconn(conn, close=broken or bool(conn.closed))
+        finally:
+            self.slots.release()
+
+    def _is_healthy(self, conn):
+        if time.monotonic() - self.last_used.get(id(conn), 0.0) < HEALTH_CHECK_IDLE_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _get_pool(host, name, user, password):
+    # Keyed on the credentials, so a rotated password builds a fresh pool
+    return _Pool(host, name, user, password)
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection for one unit of work"""
+    pool = _get_pool(*get_db_credentials())
+    conn = pool.checkout()
+    try:
+        yield conn
+    except psycopg2.Error:
+        pool.checkin(conn, broken=True)
+        raise
+    except BaseException:
+        pool.checkin(conn)
+        raise
+    else:
+        pool.checkin(conn)
+
+# --- CACHE: invalidation marker ---
+@st.cache_data(ttl=VERSION_CHECK_SECONDS, show_spinner=False)
+def get_data_version():
+    """
+    Latest insert time across the whole table, so backfilled and gap-filled history
+    counts too (one descending scan of the created_at index per partition). When new
+    rows land this changes, and every cached query keyed on the old value is skipped.
+    """
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT MAX(created_at) FROM daily_prices;")
+        version = cursor.fetchone()[0]
+    return str(version)
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_query(query, params, version):
+    with db_connection() as conn:
+        return pd.read_sql(query, conn, params=params)
+
+def run_query(query, params=None):
+    """Runs a read query through the shared cache, keyed by (query, params, data version)"""
+    return _cached_query(query, params, get_data_version())
+
+def clear_cache():
+    """
+    The Refresh button: re-checks the data version right away. Results stay cached
+    unless new data actually landed, so a click costs one tiny query, not a reload.
+    """
+    get_data_version.clear()
+
+# --- DATA: Query the DB ---
+# Filtering and aggregation happen in Postgres, so payloads stay flat as history grows
+
+def load_symbols():
+    """Every symbol we hold, for the selector (from the processor-maintained snapshot)"""
+    symbols = run_query("SELECT symbol FROM symbol_snapshot ORDER BY symbol;")['symbol'].tolist()
+    if not symbols:
+        # Snapshot not populated yet (fresh deploy): fall back to the base table
+        symbols = run_query("SELECT DISTINCT symbol FROM daily_prices ORDER BY symbol;")['symbol'].tolist()
+    return symbols
+
+def load_latest_closes(symbols):
+    """
+    Latest close, previous close, % change and 52-week range per symbol: primary-key
+    lookups on symbol_snapshot. Symbols the processor hasn't summarised yet are
+    computed from daily_prices instead.
+    """
+    snapshot = run_query("""
+        SELECT symbol, date, close, prev_close, pct_change, high_52w, low_52w
+        FROM symbol_snapshot
+        WHERE symbol = ANY(%(symbols)s)
+        ORDER BY symbol;
+    """, {"symbols": list(symbols)})
+
+    missing = [symbol for symbol in symbols if symbol not in set(snapshot['symbol'])]
+    if not missing:
+        return snapshot
+    return pd.concat([snapshot, _compute_latest_closes(missing)]).sort_values('symbol')
+
+def _compute_latest_closes(symbols):
+    """
+    The LATERAL LIMIT 2 walks the (symbol, date) primary key backwards,
+    so this reads two rows per symbol.
+    """
+    query = """
+        SELECT symbol, date, close, prev_close,
+               (close - prev_close) / NULLIF(prev_close, 0) * 100 AS pct_change
+        FROM (
+            SELECT s.symbol, l.date, l.close,
+                   LAG(l.close) OVER (PARTITION BY s.symbol ORDER BY l.date) AS prev_close,
+                   ROW_NUMBER() OVER (PARTITION BY s.symbol ORDER BY l.date DESC) AS rn
+            FROM unnest(%(symbols)s::text[]) AS s(symbol)
+            CROSS JOIN LATERAL (
+                SELECT date, close FROM daily_prices d
+                WHERE d.symbol = s.symbol
+                ORDER BY date DESC
+                LIMIT 2
+            ) l
+        ) t
+        WHERE rn = 1
+        ORDER BY symbol;
+    """
+    return run_query(query, {"symbols": list(symbols)})
+
+def range_start(label):
+    """First date covered by a RANGE_OPTIONS label (None = no lower bound)"""
+    days = RANGE_OPTIONS[label]
+    return date.today() - timedelta(days=days) if days else None
+
+def load_price_series(symbols, start=None, end=None):
+    """OHLCV rows for the selected symbols and date range only (prunes to the matching partitions)"""
+    conditions = ["symbol = ANY(%(symbols)s)"]
+    if start:
+        conditions.append("date >= %(start)s")
+    if end:
+        conditions.append("date <= %(end)s")
+
+    query = f"""
+        SELECT date, symbol, open, high, low, close, volume, created_at
+        FROM daily_prices
+        WHERE {' AND '.join(conditions)}
+        ORDER BY date ASC;
+    """
+    return run_query(query, {"symbols": list(symbols), "start": start, "end": end})
+
+def load_ohlc_rollups(symbols, period, start=None):
+    """Pre-aggregated candles from ohlc_rollups, shaped like load_price_series rows"""
+    conditions = ["symbol = ANY(%(symbols)s)", "period = %(period)s"]
+    if start:
+        # Keep the period the range starts in, not just the ones wholly inside it
+        conditions.append("period_start >= date_trunc(%(period)s, %(start)s::timestamp)::date")
+
+    query = f"""
+        SELECT period_start AS date, symbol, open, high, low, close, volume
+        FROM ohlc_rollups
+        WHERE {' AND '.join(conditions)}
+        ORDER BY period_start ASC;
+    """
+    return run_query(query, {"symbols": list(symbols), "period": period, "start": start})
+
+def load_candles(df, symbols, range_label):
+    """
+    Candles for the chart: picks the size for the visible range, then reads anything
+    above daily from ohlc_rollups. Symbols the processor hasn't summarised yet are
+    resampled from `df` instead. Returns (frame, candle size label).
+    """
+    label, offset, days = choose_ohlc_rule(df)
+    if days == 1:
+        return df, label
+
+    candles = load_ohlc_rollups(symbols, ROLLUP_PERIODS[label], start=range_start(range_label))
+    missing = df[~df['symbol'].isin(candles['symbol'])]
+    if not missing.empty:
+        candles = pd.concat([candles, resample_ohlc(missing, offset)])
+    return candles, label
+
+def load_records_page(symbols, after=None, page_size=RECORDS_PAGE_SIZE):
+    """
+    One page of raw rows, newest first. Keyset pagination: `after` is the
+    (date, symbol) of the previous page's last row, so every page is a backward
+    range scan of the (date, symbol) index (partitions.create_indexes), however
+    deep you page.
+    """
+    conditions = ["symbol = ANY(%(symbols)s)"]
+    params = {"symbols": list(symbols), "limit": page_size}
+    if after:
+        conditions.append("(date, symbol) < (%(after_date)s, %(after_symbol)s)")
+        params.update(after_date=after[0], after_symbol=after[1])
+
+    query = f"""
+        SELECT date, symbol, open, high, low, close, volume
+        FROM daily_prices
+        WHERE {' AND '.join(conditions)}
+        ORDER BY date DESC, symbol DESC
+        LIMIT %(limit)s;
+    """
+    return run_query(query, params)
+
+# --- LIVE: change notifications from the processor ---
+class ChangeListener(threading.Thread):
+    """
+    Holds one LISTEN connection for the whole server process and bumps `version`
+    on every notification. Sessions compare it with the version they last saw.
+    Credentials are looked up on every (re)connect, so a rotated password is picked up.
+    """
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.version = 0
+
+    def run(self):
+        refresh = False
+        while True:
+            conn = None
+            try:
+                host, name, user, password = _cached_credentials(refresh)
+                conn = psycopg2.connect(host=host, database=name, user=user, password=password)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL};")
+                refresh = False
+                # Anything could have landed while we were (re)connecting
+                self.version += 1
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.version += 1
+            except Exception as e:
+                print(f"⚠️ Change listener dropped, reconnecting: {e}")
+                # The password may have been rotated under us: ask Secrets Manager again
+                refresh = True
+                time.sleep(5)
+            finally:
+                # Don't leave the dead session's socket and server backend behind
+                if conn is not None:
+                    conn.close()
+
+@st.cache_resource(show_spinner=False)
+def get_change_listener():
+    listener = ChangeListener()
+    listener.start()
+    return listener
+
+def load_price_updates(symbols, since=None, start=None):
+    """
+    Rows written after `since` (minus LIVE_OVERLAP) for the selected symbols/range.
+    Not cached: every session asks for its own delta, and it's small.
+    """
+    conditions = ["symbol = ANY(%(symbols)s)"]
+    params = {"symbols": list(symbols), "start": start}
+    if since is not None and pd.notna(since):
+        conditions.append("created_at > %(since)s")
+        params["since"] = pd.Timestamp(since).to_pydatetime() - LIVE_OVERLAP
+    if start:
+        conditions.append("date >= %(start)s")
+
+    query = f"""
+        SELECT date, symbol, open, high, low, close, volume, created_at
+        FROM daily_prices
+        WHERE {' AND '.join(conditions)}
+        ORDER BY date ASC;
+    """
+    with db_connection() as conn:
+        return pd.read_sql(query, conn, params=params)
+
+def get_live_frame(symbols, range_label):
+    """
+    The session's price series for the current selection. Loaded once through the
+    shared cache, then kept current in place: when the listener reports a change,
+    only rows newer than the frame's watermark are fetched and merged in.
+    """
+    listener = get_change_listener()
+    selection = (tuple(symbols), range_label)
+    live = st.session_state.get("live_frame")
+
+    if live is None or live["selection"] != selection:
+        live = {
+            "selection": selection,
+            "version": listener.version,
+            "revision": live["revision"] + 1 if live else 0,
+            "df": load_price_series(symbols, start=range_start(range_label)),
+        }
+        st.session_state["live_frame"] = live
+        return live["df"]
+
+    version = listener.version
+    if version != live["version"]:
+        live["version"] = version
+        df = live["df"]
+        updates = load_price_updates(
+            symbols,
+            since=df['created_at'].max() if not df.empty else None,
+            start=range_start(range_label)
+        )
+        if not updates.empty:
+            live["df"] = (
+                pd.concat([df, updates])
+                .drop_duplicates(subset=['symbol', 'date'], keep='last')
+                .sort_values('date', kind='stable')
+                .reset_index(drop=True)
+            )
+            live["revision"] += 1
+            # Metrics come from the shared cache; make it re-check its version now
+            clear_cache()
+
+    return live["df"]
+
+def live_revision():
+    """Bumped whenever get_live_frame's frame changes, so the page knows when to redraw the chart"""
+    live = st.session_state.get("live_frame")
+    return live["revision"] if live else None
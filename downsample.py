@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# Server-side downsampling for the dashboard charts: the browser only ever gets
+# a bounded number of points per symbol, whatever the history length.
+
+# Line charts: points per symbol after LTTB
+MAX_LINE_POINTS = 1000
+
+# Candlesticks: bars per symbol after OHLC resampling
+MAX_CANDLES = 300
+
+# Candle sizes, smallest first: (label, pandas offset, approx. days per candle)
+OHLC_RULES = [
+    ("Daily", pd.offsets.Day(), 1),
+    ("Weekly", pd.offsets.Week(weekday=4), 7),
+    ("Monthly", pd.offsets.MonthEnd(), 30),
+    ("Quarterly", pd.offsets.QuarterEnd(), 91),
+    ("Yearly", pd.offsets.YearEnd(), 365),
+]
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the visual
+    shape of the series (peaks and troughs survive, flat stretches thin out).
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bucket = (n - 2) / (n_out - 2)
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+
+        # Third vertex: the average of the next bucket
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Keep the point in this bucket spanning the largest triangle with the last kept point
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+def downsample_lines(df, max_points=MAX_LINE_POINTS, x="date", y="close", group="symbol"):
+    """LTTB per symbol. Frames already under `max_points` per symbol come back untouched."""
+    if df.empty or df.groupby(group).size().max() <= max_points:
+        return df
+
+    parts = []
+    for _, series in df.groupby(group, sort=False):
+        timestamps = pd.to_datetime(series[x]).to_numpy().astype("datetime64[ns]").astype(np.int64)
+        keep = lttb(timestamps, series[y].astype(float).to_numpy(), max_points)
+        parts.append(series.iloc[keep])
+    return pd.concat(parts)
+
+def choose_ohlc_rule(df, max_candles=MAX_CANDLES, x="date"):
+    """Smallest candle size that keeps the visible range under `max_candles` per symbol"""
+    if df.empty:
+        return OHLC_RULES[0]
+    dates = pd.to_datetime(df[x])
+    span_days = max((dates.max() - dates.min()).days, 1)
+    # Daily bars only trade ~5 of every 7 days
+    for rule in OHLC_RULES:
+        if span_days * (5 / 7 if rule[2] == 1 else 1) / rule[2] <= max_candles:
+            return rule
+    return OHLC_RULES[-1]
+
+def resample_ohlc(df, offset, x="date", group="symbol"):
+    """Re-buckets OHLCV rows into larger candles, per symbol"""
+    parts = []
+    for symbol, series in df.groupby(group, sort=False):
+        bars = (
+            series.set_index(pd.to_datetime(series[x]))[["open", "high", "low", "close", "volume"]]
+            .astype(float)
+            .resample(offset)
+            .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+            .dropna(subset=["close"])
+        )
+        bars.index.name = x
+        parts.append(bars.reset_index().assign(**{group: symbol}))
+    return pd.concat(parts) if parts else df
+
+def downsample_ohlc(df, max_candles=MAX_CANDLES):
+    """Picks a candle size for the visible range and resamples. Returns (frame, rule label)."""
+    label, offset, days = choose_ohlc_rule(df, max_candles)
+    if days == 1:
+        return df, label
+    return resample_ohlc(df, offset), label
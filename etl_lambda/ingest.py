@@ -1,45 +1,220 @@
 import yfinance as yf
 import boto3
 import json
+import os
 import pandas as pd
+import psycopg2
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from datetime import datetime
+from raw_zone import RAW_FORMAT, encode_frame, encode_batch, raw_prefix
+from aws_secrets import get_secrets
+from watermarks import load_intraday_plan, load_plan, record_empty_gaps
 
 # S3 Configuration
 S3_BUCKET_NAME = "tadawul-data-lake-v1-tarig-elamin"
-SYMBOLS = ["TSLA", "NVDA", "AAPL"]
 
-def save_raw_to_s3(data: pd.DataFrame, symbol: str):
-    s3 = boto3.client('s3')
+# Watchlist: override with a comma-separated SYMBOLS env var (e.g. "2222.SR,1120.SR,AAPL")
+SYMBOLS = [s.strip() for s in os.environ.get("SYMBOLS", "TSLA,NVDA,AAPL").split(",") if s.strip()]
+
+# Concurrency cap: symbols in flight at once. Keep it modest so Yahoo doesn't rate limit us.
+MAX_WORKERS = int(os.environ.get("MAX_WORKERS", "8"))
+# Every symbol is submitted up front and collected as it finishes, so one slow fetch only
+# holds its own worker. Whatever is still running this long before the Lambda timeout is
+# reported as timed out, leaving time to upload what did finish.
+DEADLINE_MARGIN_SECONDS = int(os.environ.get("DEADLINE_MARGIN_SECONDS", "20"))
+
+# Batch mode: one multi-symbol object + manifest per run instead of one object per symbol.
+# That's one PUT, one S3 event and one processor invocation regardless of watchlist size.
+BATCH_MODE = os.environ.get("BATCH_MODE", "false").lower() == "true"
+
+# Incremental mode: fetch only bars after each symbol's last stored date (plus detected gaps).
+# Symbols the DB has never seen, or every symbol if the DB is unreachable, fall back to DEFAULT_PERIOD.
+INCREMENTAL = os.environ.get("INCREMENTAL", "true").lower() == "true"
+DEFAULT_PERIOD = "5d"
+
+# Bar size: "1d" (default, lands in daily_prices) or an intraday interval such as "1m"/"5m"
+# (lands in intraday_prices). A scheduled event can override it with {"interval": "5m"}.
+INTERVAL = os.environ.get("INTERVAL", "1d")
+# Intraday runs fetch from each symbol's last stored bar for the interval (the loader
+# overwrites bars it already has); symbols with no bars yet get the latest session
+INTRADAY_PERIOD = "1d"
+
+# Lambda can only write under /tmp. A warm container then keeps yfinance's timezone
+# and cookie caches between invocations instead of refetching them.
+yf.set_tz_cache_location(os.environ.get("YF_CACHE_DIR", "/tmp/py-yfinance"))
+
+# One shared client: creating clients from the default session isn't thread-safe
+s3 = boto3.client('s3')
+
+def save_raw_to_s3(data: pd.DataFrame, symbol: str, interval: str = "1d"):
     today = datetime.now()
-    # Path: raw/YYYY/MM/DD/symbol.json
-    path = f"raw/{today.year}/{today.month:02d}/{today.day:02d}/{symbol}.json"
-    
-    # Save as JSON
-    json_data = data.to_json(orient="index", date_format="iso")
+    # Encode as RAW_FORMAT (json or parquet)
+    body, extension, content_type = encode_frame(data, RAW_FORMAT)
+
+    # Path: raw/YYYY/MM/DD/symbol.json (or .parquet); intraday under raw/intraday/{interval}/
+    path = f"{raw_prefix(interval, today)}/{symbol}{extension}"
     
     try:
         s3.put_object(
             Bucket=S3_BUCKET_NAME,
             Key=path,
-            Body=json_data,
-            ContentType='application/json'
+            Body=body,
+            ContentType=content_type
         )
         print(f"   🌊 Saved to S3: {path}")
     except Exception as e:
         print(f"   ⚠️ S3 Upload Failed: {e}")
         raise e
 
-def lambda_handler(event, context):
-    print("🚀 Starting Ingest (API -> S3)...")
-    
-    for symbol in SYMBOLS:
-        print(f"   📡 Fetching {symbol}...")
-        stock = yf.Ticker(symbol)
-        data = stock.history(period="5d")
-        
-        if not data.empty:
-            save_raw_to_s3(data, symbol)
+def save_batch_to_s3(frames: dict, results: dict, interval: str = "1d"):
+    """Writes every fetched symbol as one object, then a manifest describing it"""
+    today = datetime.now()
+    run_id = today.strftime("%H%M%S")
+
+    body, extension, content_type = encode_batch(frames, RAW_FORMAT, interval)
+    # Path: raw/YYYY/MM/DD/batch-HHMMSS.json (or .parquet)
+    path = f"{raw_prefix(interval, today)}/batch-{run_id}{extension}"
+
+    # Manifests live outside raw/ so they don't fire the processor's S3 trigger
+    manifest_path = f"{raw_prefix(interval, today, zone='manifests')}/batch-{run_id}.json"
+    manifest = {
+        "key": path,
+        "format": RAW_FORMAT,
+        "interval": interval,
+        "created_at": today.isoformat(),
+        "symbols": {symbol: len(df) for symbol, df in frames.items()},
+        "results": results
+    }
+
+    try:
+        s3.put_object(Bucket=S3_BUCKET_NAME, Key=path, Body=body, ContentType=content_type)
+        s3.put_object(
+            Bucket=S3_BUCKET_NAME,
+            Key=manifest_path,
+            Body=json.dumps(manifest),
+            ContentType='application/json'
+        )
+        print(f"   🌊 Saved batch of {len(frames)} symbols to S3: {path}")
+    except Exception as e:
+        print(f"   ⚠️ S3 Upload Failed: {e}")
+        raise e
+
+def connect_db():
+    secrets = get_secrets()
+    return psycopg2.connect(
+        user=secrets['DB_USER'], password=secrets['DB_PASS'],
+        host=secrets['DB_HOST'], database=secrets['DB_NAME'],
+        connect_timeout=5
+    )
+
+def get_fetch_plan(interval="1d"):
+    """{symbol: [Ticker.history kwargs]} from the DB high-water marks (per interval for intraday)"""
+    default_period = DEFAULT_PERIOD if interval == "1d" else INTRADAY_PERIOD
+    fallback = {symbol: [{"period": default_period}] for symbol in SYMBOLS}
+    if not INCREMENTAL:
+        return fallback
+
+    try:
+        conn = connect_db()
+        cursor = conn.cursor()
+        if interval == "1d":
+            plan = load_plan(cursor, SYMBOLS, DEFAULT_PERIOD)
         else:
+            plan = load_intraday_plan(cursor, SYMBOLS, interval, INTRADAY_PERIOD)
+        cursor.close()
+        conn.close()
+        return plan
+    except Exception as e:
+        print(f"   ⚠️ Watermark lookup failed, fetching {default_period} for every symbol: {e}")
+        return fallback
+
+def save_empty_gaps(gaps):
+    """Gaps Yahoo had nothing for: recorded so the next runs stop asking (best effort)"""
+    try:
+        conn = connect_db()
+        with conn.cursor() as cursor:
+            record_empty_gaps(cursor, gaps)
+        conn.commit()
+        conn.close()
+        print(f"   🕳️ Recorded {len(gaps)} empty gap(s): {gaps}")
+    except Exception as e:
+        print(f"   ⚠️ Could not record empty gaps: {e}")
+
+def ingest_symbol(symbol, windows, interval="1d", batch=None, empty_gaps=None):
+    """
+    Fetch one symbol's windows, then upload it (or, in batch mode, add it to `batch`).
+    Gap windows (start and end) that come back empty are appended to `empty_gaps`.
+    Never raises: errors come back as a status string.
+    """
+    try:
+        if not windows:
+            print(f"   ⏭️ {symbol} is up to date")
+            return "up to date"
+
+        print(f"   📡 Fetching {symbol} {windows}...")
+        stock = yf.Ticker(symbol)
+        parts = []
+        for window in windows:
+            part = stock.history(interval=interval, **window)
+            if not part.empty:
+                parts.append(part)
+            elif empty_gaps is not None and "end" in window:
+                empty_gaps.append((symbol, window["start"], window["end"]))
+
+        if not parts:
             print(f"   ⚠️ No data for {symbol}")
+            return "empty"
+
+        data = pd.concat(parts).sort_index()
+        data = data[~data.index.duplicated()]
+
+        if batch is not None:
+            batch[symbol] = data
+        else:
+            save_raw_to_s3(data, symbol, interval)
+        return "ok"
+    except Exception as e:
+        print(f"   ❌ {symbol} failed: {e}")
+        return f"error: {e}"
+
+def lambda_handler(event, context):
+    interval = (event or {}).get("interval", INTERVAL)
+    print(f"🚀 Starting Ingest (API -> S3) for {len(SYMBOLS)} symbols @ {interval}...")
+
+    plan = get_fetch_plan(interval)
+
+    timeout = None
+    if context is not None:
+        timeout = max(0, context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN_SECONDS)
+
+    results = {}
+    frames = {} if BATCH_MODE else None
+    empty_gaps = []
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    futures = {
+        executor.submit(ingest_symbol, symbol, plan[symbol], interval, frames, empty_gaps): symbol
+        for symbol in SYMBOLS
+    }
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            results[futures[future]] = future.result()
+    except TimeoutError:
+        print(f"   ⏱️ Deadline reached, {len(futures) - len(results)} symbols still in flight")
+    finally:
+        # Don't wait for stragglers: queued symbols are dropped, running ones are abandoned
+        executor.shutdown(wait=False, cancel_futures=True)
+    results = {symbol: results.get(symbol, "error: timed out") for symbol in SYMBOLS}
+
+    if frames:
+        # A straggler may still add itself after the deadline; only upload what reported ok
+        frames = {symbol: frames[symbol] for symbol, status in results.items() if status == "ok" and symbol in frames}
+    if frames:
+        save_batch_to_s3(frames, results, interval)
+
+    if empty_gaps:
+        save_empty_gaps(list(empty_gaps))
+
+    failed = [symbol for symbol, status in results.items() if status.startswith("error")]
+    print(f"   📊 Ingest done: {len(results) - len(failed)} ok, {len(failed)} failed")
 
-    return {'statusCode': 200, 'body': json.dumps('Ingest Complete')}
\ No newline at end of file
+    return {'statusCode': 200, 'body': json.dumps({'results': results, 'failed': failed})}
@@ -0,0 +1,146 @@
+import io
+import os
+import pandas as pd
+
+# Frames with fewer rows than this keep the simple row-by-row INSERT path.
+# Anything bigger is COPY'd into a staging table and merged in one statement.
+BULK_LOAD_THRESHOLD = int(os.environ.get("BULK_LOAD_THRESHOLD", "50"))
+
+PRICE_COLUMNS = ["symbol", "date", "open", "high", "low", "close", "volume"]
+BAR_COLUMNS = ["symbol", "interval", "ts", "open", "high", "low", "close", "volume"]
+STREAM_BAR_COLUMNS = BAR_COLUMNS + ["vwap"]
+TICK_COLUMNS = ["symbol", "ts", "price", "day_volume", "last_size"]
+
+# Bars still being built (streamed 1m bars) widen the stored bar instead of being skipped
+MERGE_BAR = """
+DO UPDATE SET high = GREATEST(intraday_prices.high, EXCLUDED.high),
+              low = LEAST(intraday_prices.low, EXCLUDED.low),
+              close = EXCLUDED.close,
+              volume = GREATEST(intraday_prices.volume, EXCLUDED.volume),
+              vwap = EXCLUDED.vwap
+"""
+
+# Polled bars: the latest fetch wins, so a bar stored while still forming gets corrected
+REPLACE_BAR = """
+DO UPDATE SET open = EXCLUDED.open,
+              high = EXCLUDED.high,
+              low = EXCLUDED.low,
+              close = EXCLUDED.close,
+              volume = EXCLUDED.volume
+"""
+
+INSERT_QUERY = """
+INSERT INTO daily_prices (symbol, date, open, high, low, close, volume)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (symbol, date) DO NOTHING;
+"""
+
+def to_price_rows(symbol, df):
+    """Maps a yfinance-shaped frame (Open/High/.../Volume, date index) onto daily_prices columns"""
+    return pd.DataFrame({
+        "symbol": symbol,
+        "date": df.index.astype(str).str[:10],  # Truncate time
+        "open": df["Open"].astype(float).to_numpy(),
+        "high": df["High"].astype(float).to_numpy(),
+        "low": df["Low"].astype(float).to_numpy(),
+        "close": df["Close"].astype(float).to_numpy(),
+        "volume": df["Volume"].fillna(0).astype("int64").to_numpy(),
+    })
+
+def to_bar_rows(symbol, interval, df):
+    """Maps an intraday frame onto intraday_prices columns, timestamps normalized to UTC"""
+    ts = pd.to_datetime(df.index, utc=True)  # tz-aware index or ISO strings from JSON
+    return pd.DataFrame({
+        "symbol": symbol,
+        "interval": interval,
+        "ts": ts.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+        "open": df["Open"].astype(float).to_numpy(),
+        "high": df["High"].astype(float).to_numpy(),
+        "low": df["Low"].astype(float).to_numpy(),
+        "close": df["Close"].astype(float).to_numpy(),
+        "volume": df["Volume"].fillna(0).astype("int64").to_numpy(),
+    })
+
+def insert_rows(cursor, symbol, df):
+    """Simple path: one INSERT ... ON CONFLICT per row"""
+    rows = to_price_rows(symbol, df)
+    for row in rows.itertuples(index=False):
+        cursor.execute(INSERT_QUERY, (
+            row.symbol, row.date,
+            float(row.open), float(row.high),
+            float(row.low), float(row.close),
+            int(row.volume)
+        ))
+    return len(rows)
+
+def copy_merge(cursor, table, columns, conflict_columns, rows, on_conflict="DO NOTHING"):
+    """
+    COPY `rows` into a temp staging copy of `table`, then one set-based merge into it.
+    Rows sharing a conflict key are collapsed first: ON CONFLICT DO UPDATE refuses to touch
+    the same target row twice. An update merge keeps the last one (the newest state of that
+    row); DO NOTHING keeps the first, as row-by-row inserts would.
+    """
+    staging = f"staging_{table}"
+    column_list = ", ".join(columns)
+    keep = "first" if on_conflict.strip().upper() == "DO NOTHING" else "last"
+    rows = rows.drop_duplicates(subset=conflict_columns, keep=keep)
+
+    # Staging table lives only for the current transaction
+    cursor.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {staging}
+        (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP;
+    """)
+
+    buffer = io.StringIO()
+    rows.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    cursor.execute(f"""
+        INSERT INTO {table} ({column_list})
+        SELECT {column_list} FROM {staging}
+        ON CONFLICT ({', '.join(conflict_columns)}) {on_conflict};
+    """)
+    cursor.execute(f"TRUNCATE {staging};")
+    return len(rows)
+
+def copy_rows(cursor, symbol, df):
+    """Bulk path: COPY into a temp staging table, then one set-based merge into daily_prices"""
+    return copy_merge(cursor, "daily_prices", PRICE_COLUMNS, ["symbol", "date"], to_price_rows(symbol, df))
+
+def write_prices(cursor, symbol, df, threshold=BULK_LOAD_THRESHOLD):
+    """Picks the load path by frame size. Returns the number of rows sent to the DB."""
+    if df.empty:
+        return 0
+    if len(df) < threshold:
+        return insert_rows(cursor, symbol, df)
+    return copy_rows(cursor, symbol, df)
+
+def write_bars(cursor, symbol, interval, df):
+    """
+    Intraday bars always take the COPY path: even one session of 1m bars is ~390 rows.
+    Stored bars are overwritten, since the last bar of a run is usually still forming.
+    """
+    if df.empty:
+        return 0
+    rows = to_bar_rows(symbol, interval, df)
+    return copy_merge(cursor, "intraday_prices", BAR_COLUMNS, ["symbol", "interval", "ts"], rows, REPLACE_BAR)
+
+def upsert_bars(cursor, rows):
+    """
+    Streamed bars, already in STREAM_BAR_COLUMNS shape. A bar may be written many times while
+    it is open: each write keeps the stored open and widens high/low/volume.
+    """
+    if rows.empty:
+        return 0
+    return copy_merge(cursor, "intraday_prices", STREAM_BAR_COLUMNS, ["symbol", "interval", "ts"], rows, MERGE_BAR)
+
+def copy_ticks(cursor, rows):
+    """Raw ticks are append-only, so they COPY straight into the table with no staging step"""
+    if rows.empty:
+        return 0
+    buffer = io.StringIO()
+    rows[TICK_COLUMNS].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY ticks ({', '.join(TICK_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    return len(rows)
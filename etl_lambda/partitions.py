@@ -0,0 +1,211 @@
+from datetime import date
+
+# daily_prices is range-partitioned on date. "year" suits daily bars; "month" for denser tables.
+PARTITION_GRANULARITY = "year"
+
+# intraday_prices is range-partitioned on ts; 1m bars are ~390x denser, so monthly
+INTRADAY_GRANULARITY = "month"
+
+# ticks holds raw streamed trades (stream_ticks.py); denser still, same monthly ranges
+TICK_GRANULARITY = "month"
+
+# How many partitions past the current one maintenance keeps ready
+PARTITIONS_AHEAD = 2
+
+CREATE_PARTITIONED_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    symbol VARCHAR(20) NOT NULL,
+    date DATE NOT NULL,
+    open DECIMAL(10, 2),
+    high DECIMAL(10, 2),
+    low DECIMAL(10, 2),
+    close DECIMAL(10, 2),
+    volume BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, date)
+) PARTITION BY RANGE (date);
+"""
+
+CREATE_INTRADAY_TABLE = """
+CREATE TABLE IF NOT EXISTS intraday_prices (
+    symbol VARCHAR(20) NOT NULL,
+    interval VARCHAR(5) NOT NULL,
+    ts TIMESTAMPTZ NOT NULL,
+    open NUMERIC(12, 4),
+    high NUMERIC(12, 4),
+    low NUMERIC(12, 4),
+    close NUMERIC(12, 4),
+    volume BIGINT,
+    vwap NUMERIC(12, 4),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, interval, ts)
+) PARTITION BY RANGE (ts);
+"""
+
+CREATE_TICKS_TABLE = """
+CREATE TABLE IF NOT EXISTS ticks (
+    symbol VARCHAR(20) NOT NULL,
+    ts TIMESTAMPTZ NOT NULL,
+    price NUMERIC(12, 4),
+    day_volume BIGINT,
+    last_size BIGINT,
+    received_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+) PARTITION BY RANGE (ts);
+"""
+
+def partition_bounds(day, granularity=PARTITION_GRANULARITY):
+    """The partition holding `day`: (suffix, start, end), end exclusive"""
+    if granularity == "month":
+        start = date(day.year, day.month, 1)
+        end = date(day.year + (day.month == 12), day.month % 12 + 1, 1)
+        return f"m{day.year}_{day.month:02d}", start, end
+    start = date(day.year, 1, 1)
+    return f"y{day.year}", start, date(day.year + 1, 1, 1)
+
+def is_partitioned(cursor, table="daily_prices"):
+    cursor.execute("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = %s
+        );
+    """, (table,))
+    return cursor.fetchone()[0]
+
+def create_partitioned_table(cursor, table="daily_prices"):
+    """Parent table plus a DEFAULT partition, so a missed maintenance run never rejects inserts"""
+    cursor.execute(CREATE_PARTITIONED_TABLE.format(table=table))
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT;")
+    create_indexes(cursor, table)
+
+def create_indexes(cursor, table="daily_prices"):
+    """
+    Secondary indexes beyond the (symbol, date) key. Idempotent, so init_db and partition
+    maintenance re-run it on tables created before an index was added.
+    """
+    # The dashboard's live view asks "what landed since X?"
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_created_at_idx ON {table} (created_at);")
+    # The dashboard's records table pages newest-first across symbols, keyed on (date, symbol)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_date_symbol_idx ON {table} (date, symbol);")
+
+def create_intraday_table(cursor):
+    """Timestamp-keyed bar table for 1m/5m/... bars, kept apart from daily_prices"""
+    cursor.execute(CREATE_INTRADAY_TABLE)
+    # Only streamed bars carry a VWAP; polled yfinance bars leave it NULL
+    cursor.execute("ALTER TABLE intraday_prices ADD COLUMN IF NOT EXISTS vwap NUMERIC(12, 4);")
+    cursor.execute("CREATE TABLE IF NOT EXISTS intraday_prices_default PARTITION OF intraday_prices DEFAULT;")
+
+def create_ticks_table(cursor):
+    """Append-only tick log: no primary key, several trades can share a timestamp"""
+    cursor.execute(CREATE_TICKS_TABLE)
+    cursor.execute("CREATE TABLE IF NOT EXISTS ticks_default PARTITION OF ticks DEFAULT;")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ticks_symbol_ts_idx ON ticks (symbol, ts);")
+
+def create_partition(cursor, day, table="daily_prices", granularity=PARTITION_GRANULARITY, column="date"):
+    """
+    Creates the partition holding `day` if it doesn't exist yet. Rows that already
+    landed in the DEFAULT partition for that range are moved over before attaching.
+    """
+    suffix, start, end = partition_bounds(day, granularity)
+    name = f"{table}_{suffix}"
+
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (name,))
+    if cursor.fetchone()[0]:
+        return None
+
+    cursor.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);")
+    cursor.execute(f"""
+        WITH moved AS (
+            DELETE FROM {table}_default WHERE {column} >= %s AND {column} < %s RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved;
+    """, (start, end))
+    cursor.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s);",
+        (start, end)
+    )
+    return name
+
+def ensure_partitions(cursor, first_day, last_day, table="daily_prices", granularity=PARTITION_GRANULARITY, column="date"):
+    """Creates every partition between two dates (inclusive). Returns the names created."""
+    created = []
+    day = first_day
+    while day <= last_day:
+        name = create_partition(cursor, day, table, granularity, column)
+        if name:
+            created.append(name)
+        day = partition_bounds(day, granularity)[2]
+    return created
+
+def ensure_future_partitions(cursor, ahead=PARTITIONS_AHEAD, table="daily_prices", granularity=PARTITION_GRANULARITY, column="date"):
+    """The maintenance routine: current partition plus `ahead` more, ready before data arrives"""
+    last_day = date.today()
+    for _ in range(ahead):
+        last_day = partition_bounds(last_day, granularity)[2]
+    return ensure_partitions(cursor, date.today(), last_day, table, granularity, column)
+
+def ensure_future_daily_partitions(cursor, ahead=PARTITIONS_AHEAD):
+    """No-op until init_db has migrated daily_prices to a partitioned table"""
+    if not is_partitioned(cursor):
+        print("   ⚠️ daily_prices is not partitioned yet (run init_db.py to migrate), skipping its partitions")
+        return []
+    return ensure_future_partitions(cursor, ahead)
+
+def ensure_future_intraday_partitions(cursor, ahead=PARTITIONS_AHEAD):
+    return ensure_future_partitions(cursor, ahead, "intraday_prices", INTRADAY_GRANULARITY, "ts")
+
+def ensure_future_tick_partitions(cursor, ahead=PARTITIONS_AHEAD):
+    """No-op until init_db has created the ticks table (streaming is optional)"""
+    cursor.execute("SELECT to_regclass('ticks') IS NOT NULL;")
+    if not cursor.fetchone()[0]:
+        return []
+    return ensure_future_partitions(cursor, ahead, "ticks", TICK_GRANULARITY, "ts")
+
+def detach_partitions_before(cursor, cutoff, table="daily_prices"):
+    """
+    Detaches partitions that end on or before `cutoff`. They stay as plain tables
+    (archive, dump or drop at leisure) but queries and vacuum stop touching them.
+    """
+    cursor.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = %s;
+    """, (table,))
+
+    detached = []
+    for name, bound in cursor.fetchall():
+        if bound == "DEFAULT":
+            continue
+        # e.g. FOR VALUES FROM ('2015-01-01') TO ('2016-01-01')
+        end = date.fromisoformat(bound.split("TO ('")[1][:10])
+        if end <= cutoff:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name};")
+            detached.append(name)
+    return detached
+
+def migrate_to_partitioned(cursor, table="daily_prices"):
+    """
+    One-off migration of an existing heap table: it is renamed to {table}_legacy,
+    a partitioned {table} is created with partitions over the legacy date range,
+    and the rows are copied across. The legacy table is kept until you drop it.
+    """
+    legacy = f"{table}_legacy"
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy};")
+    cursor.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey;")
+    # Free the names of the heap table's other indexes too, or create_indexes would see them
+    # taken and skip building them on the partitioned table
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s;", (legacy,))
+    for (index,) in cursor.fetchall():
+        if index.startswith(f"{table}_") and not index.startswith(f"{legacy}_"):
+            cursor.execute(f"ALTER INDEX {index} RENAME TO {legacy}{index[len(table):]};")
+    create_partitioned_table(cursor, table)
+
+    cursor.execute(f"SELECT MIN(date), MAX(date) FROM {legacy};")
+    first_day, last_day = cursor.fetchone()
+    if first_day is not None:
+        ensure_partitions(cursor, first_day, last_day, table)
+
+    cursor.execute(f"INSERT INTO {table} SELECT * FROM {legacy};")
+    return cursor.rowcount
@@ -1,9 +1,15 @@
 import boto3
 import json
+import time
 import urllib.parse
 import psycopg2
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from aws_secrets import get_secrets
+from loader import write_prices, write_bars
+from partitions import ensure_future_daily_partitions, ensure_future_intraday_partitions, ensure_future_tick_partitions
+from summaries import refresh_summaries
+from raw_zone import decode_frame, decode_batch, interval_from_key, is_batch_key, symbol_from_key
 
 print("🔐 Fetching DB Credentials...")
 secrets = get_secrets()
@@ -12,66 +18,209 @@ DB_NAME = secrets['DB_NAME']
 DB_USER = secrets['DB_USER']
 DB_PASS = secrets['DB_PASS']
 
+# Parallel S3 downloads per event (boto3 clients are thread-safe)
+MAX_DOWNLOAD_WORKERS = 8
+
+# Postgres channel the dashboard LISTENs on; one NOTIFY per committed batch
+NOTIFY_CHANNEL = "prices_updated"
+
+# CloudWatch namespace for the Embedded Metric Format lines we print
+METRICS_NAMESPACE = "TadawulPipeline"
+
 s3 = boto3.client('s3')
 
-def load_to_db(symbol, df):
-    """Inserts DataFrame into RDS"""
-    if df.empty: return
+# Lives at module level so warm invocations of the same container reuse it
+_conn = None
+
+def emit_metric(name, value, unit="Count"):
+    """Prints one EMF line; CloudWatch turns it into a metric straight from the log stream"""
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Function"]],
+                "Metrics": [{"Name": name, "Unit": unit}]
+            }]
+        },
+        "Function": "process",
+        name: value
+    }))
+
+def get_connection():
+    """
+    Returns the cached connection if it still answers, otherwise opens a new one.
+    A frozen container can wake up to a socket RDS already dropped (idle timeout,
+    failover), so a reused connection has to pass a SELECT 1 first.
+    """
+    global _conn
+
+    if _conn is not None and not _conn.closed:
+        try:
+            with _conn.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            _conn.rollback()
+            emit_metric("DBConnectionReused", 1)
+            return _conn
+        except psycopg2.Error as e:
+            print(f"   ♻️ Cached connection is dead, reconnecting: {e}")
+            close_connection()
+
+    start = time.perf_counter()
+    _conn = psycopg2.connect(
+        user=DB_USER, password=DB_PASS, host=DB_HOST, database=DB_NAME
+    )
+    emit_metric("DBConnectionOpened", 1)
+    emit_metric("DBConnectLatency", (time.perf_counter() - start) * 1000, unit="Milliseconds")
+    return _conn
+
+def close_connection():
+    global _conn
+    if _conn is not None:
+        try:
+            _conn.close()
+        except psycopg2.Error:
+            pass
+    _conn = None
+
+def read_record(bucket, key):
+    """Downloads one S3 object and parses it into {symbol: DataFrame}"""
+    response = s3.get_object(Bucket=bucket, Key=key)
+    body = response['Body'].read()
+
+    # Batch objects carry many symbols; per-symbol objects are named after theirs.
+    # .parquet or legacy .json, decided by the key's extension.
+    if is_batch_key(key):
+        return decode_batch(body, key)
+    return {symbol_from_key(key): decode_frame(body, key)}
+
+def notify_payload(loaded):
+    """NOTIFY payloads are capped at 8000 bytes: past that, send no list (= 'everything may have changed')"""
+    payload = json.dumps({"symbols": sorted(loaded)})
+    if len(payload) > 7900:
+        payload = json.dumps({"symbols": None})
+    return payload
+
+def load_to_db(frames):
+    """
+    Inserts every {key: {symbol: DataFrame}} into RDS over one connection
+    and one transaction. Each symbol runs under its own savepoint, so a bad
+    symbol is rolled back on its own and the rest of the batch still commits.
+    Returns {key: error message or None}.
+    """
+    results = {}
+    if not frames: return results
+
+    # {symbol: earliest daily date loaded}, drives the incremental summary refresh
+    loaded = {}
 
     try:
-        conn = psycopg2.connect(
-            user=DB_USER, password=DB_PASS, host=DB_HOST, database=DB_NAME
-        )
+        conn = get_connection()
         cursor = conn.cursor()
 
-        # --- FIX: Use iterrows() instead of items() ---
-        for date_obj, row in df.iterrows():
-            # Ensure date is a string (Pandas might parse it to Timestamp)
-            date_str = str(date_obj)
-            
-            insert_query = """
-            INSERT INTO daily_prices (symbol, date, open, high, low, close, volume)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (symbol, date) DO NOTHING;
-            """
-            cursor.execute(insert_query, (
-                symbol, date_str[:10], # Truncate time
-                float(row['Open']), float(row['High']), 
-                float(row['Low']), float(row['Close']), 
-                int(row['Volume'])
-            ))
-        
+        for key, symbol_frames in frames.items():
+            errors = []
+            # raw/intraday/{interval}/... keys go to intraday_prices, the rest to daily_prices
+            interval = interval_from_key(key)
+            for symbol, df in symbol_frames.items():
+                try:
+                    cursor.execute("SAVEPOINT record;")
+                    if interval == "1d":
+                        # Small files go row by row, bigger ones through COPY + one set-based merge
+                        count = write_prices(cursor, symbol, df)
+                        if count:
+                            first_date = df.index.astype(str).str[:10].min()
+                            loaded[symbol] = min(first_date, loaded.get(symbol, first_date))
+                    else:
+                        count = write_bars(cursor, symbol, interval, df)
+                    cursor.execute("RELEASE SAVEPOINT record;")
+                    print(f"   ✅ Loaded {symbol} to Database ({count} rows).")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT record;")
+                    print(f"   ❌ Database Error ({symbol}): {e}")
+                    errors.append(f"{symbol}: {e}")
+            results[key] = "; ".join(errors) or None
+
+        # Summary tables only for what we just loaded. A failure here must not cost us the load.
+        try:
+            cursor.execute("SAVEPOINT summaries;")
+            refresh_summaries(cursor, loaded)
+            cursor.execute("RELEASE SAVEPOINT summaries;")
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT summaries;")
+            print(f"   ⚠️ Summary refresh failed: {e}")
+
+        # Postgres delivers the NOTIFY on commit, so listeners never see uncommitted rows
+        if loaded:
+            cursor.execute("SELECT pg_notify(%s, %s);", (NOTIFY_CHANNEL, notify_payload(loaded)))
+
         conn.commit()
-        print(f"   ✅ Loaded {symbol} to Database.")
         cursor.close()
-        conn.close()
 
     except Exception as e:
         print(f"   ❌ Database Error: {e}")
+        # Don't hand a half-finished transaction or broken socket to the next invocation
+        close_connection()
         raise e
 
+    return results
+
 def lambda_handler(event, context):
-    print("🚀 V2 CODE IS RUNNING (ITERROWS FIX APPLIED)")  # <--- ADD THIS LINE
     print("⚙️ Starting Processor (S3 -> RDS)...")
-    
-    bucket = event['Records'][0]['s3']['bucket']['name']
-    key = urllib.parse.unquote_plus(event['Records'][0]['s3']['object']['key'], encoding='utf-8')
-    
-    print(f"   📂 Processing file: {key}")
-    
+
+    records = event.get('Records', [])
+    objects = [
+        (record['s3']['bucket']['name'],
+         urllib.parse.unquote_plus(record['s3']['object']['key'], encoding='utf-8'))
+        for record in records
+    ]
+    keys = [key for _, key in objects]
+    print(f"   📂 Processing {len(records)} file(s)")
+
+    # 1. Download + parse everything in parallel
+    frames, results = {}, {}
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+        futures = {key: executor.submit(read_record, bucket, key) for bucket, key in objects}
+        for key, future in futures.items():
+            try:
+                frames[key] = future.result()
+            except Exception as e:
+                print(f"   ❌ Read Error ({key}): {e}")
+                results[key] = str(e)
+
+    # 2. One connection, one transaction for the whole batch
+    results.update(load_to_db(frames))
+
+    report = {key: ('ok' if results[key] is None else f"error: {results[key]}") for key in keys}
+    failed = [key for key in keys if results[key] is not None]
+    print(f"   📊 Batch done: {len(keys) - len(failed)} ok, {len(failed)} failed")
+    emit_metric("FailedRecords", len(failed))
+
+    # S3 invokes us asynchronously and ignores the return value: only a raise gets the
+    # event retried (and dead-lettered once retries run out). The records that did load
+    # are committed already, and every load path is an idempotent merge, so a retry is safe.
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(keys)} file(s) failed: {json.dumps(report)}")
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({'results': report, 'failed': failed})
+    }
+
+def maintenance_handler(event, context):
+    """Scheduled (EventBridge) entry point: keep future daily/intraday/tick partitions ready"""
+    conn = get_connection()
     try:
-        response = s3.get_object(Bucket=bucket, Key=key)
-        file_content = response['Body'].read().decode('utf-8')
-        json_content = json.loads(file_content)
-        
-        symbol = key.split('/')[-1].replace('.json', '')
-        
-        df = pd.DataFrame.from_dict(json_content, orient='index')
-        
-        load_to_db(symbol, df)
-        
-        return {'statusCode': 200, 'body': json.dumps('Processing Complete')}
-        
+        with conn.cursor() as cursor:
+            created = (
+                ensure_future_daily_partitions(cursor) + ensure_future_intraday_partitions(cursor)
+                + ensure_future_tick_partitions(cursor)
+            )
+        conn.commit()
     except Exception as e:
-        print(e)
-        raise e
\ No newline at end of file
+        print(f"   ❌ Partition maintenance failed: {e}")
+        close_connection()
+        raise e
+
+    print(f"   🧱 Created partitions: {created or 'none needed'}")
+    return {'statusCode': 200, 'body': json.dumps({'created': created})}
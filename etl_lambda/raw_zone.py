@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import pandas as pd
+
+# Raw-zone encoding for new objects: "json" (legacy) or "parquet" (zstd-compressed, columnar).
+# The reader picks the decoder from the key's extension, so old .json keys stay readable.
+RAW_FORMAT = os.environ.get("RAW_FORMAT", "json")
+
+FORMATS = {
+    "json": {"extension": ".json", "content_type": "application/json"},
+    "parquet": {"extension": ".parquet", "content_type": "application/vnd.apache.parquet"},
+}
+
+def encode_frame(df, fmt=RAW_FORMAT):
+    """Serializes a history frame for the raw zone. Returns (body, extension, content_type)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown raw format: {fmt}")
+
+    if fmt == "parquet":
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, engine="pyarrow", compression="zstd")
+        body = buffer.getvalue()
+    else:
+        body = df.to_json(orient="index", date_format="iso")
+
+    return body, FORMATS[fmt]["extension"], FORMATS[fmt]["content_type"]
+
+def raw_prefix(interval, when, zone="raw"):
+    """Daily: raw/YYYY/MM/DD. Intraday: raw/intraday/{interval}/YYYY/MM/DD."""
+    day = f"{when.year}/{when.month:02d}/{when.day:02d}"
+    if interval == "1d":
+        return f"{zone}/{day}"
+    return f"{zone}/intraday/{interval}/{day}"
+
+def interval_from_key(key):
+    """raw/intraday/5m/... -> 5m; everything else is daily"""
+    parts = key.split("/")
+    if len(parts) > 2 and parts[1] == "intraday":
+        return parts[2]
+    return "1d"
+
+def encode_batch(frames, fmt=RAW_FORMAT, interval="1d"):
+    """
+    Serializes {symbol: frame} as one object. Parquet stores a long table with a
+    Symbol column; JSON stores {symbol: {timestamp: row}}.
+    Returns (body, extension, content_type).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown raw format: {fmt}")
+
+    if fmt == "parquet":
+        # Exchanges sit in different timezones and concat would shift everything to UTC.
+        # Fine for intraday bars (the instant is what matters), but a Riyadh midnight
+        # daily bar would become the previous day, so daily batches keep local wall time.
+        combined = pd.concat([
+            (df if interval != "1d" else _local_wall_time(df)).assign(Symbol=symbol)
+            for symbol, df in frames.items()
+        ])
+        buffer = io.BytesIO()
+        combined.to_parquet(buffer, engine="pyarrow", compression="zstd")
+        body = buffer.getvalue()
+    else:
+        body = "{" + ",".join(
+            f"{json.dumps(symbol)}:{df.to_json(orient='index', date_format='iso')}"
+            for symbol, df in frames.items()
+        ) + "}"
+
+    return body, FORMATS[fmt]["extension"], FORMATS[fmt]["content_type"]
+
+def _local_wall_time(df):
+    index = df.index
+    if getattr(index, "tz", None) is not None:
+        df = df.set_axis(index.tz_localize(None))
+    return df
+
+def decode_batch(body, key):
+    """Reads a batch object back into {symbol: DataFrame}"""
+    if key.endswith(".parquet"):
+        combined = pd.read_parquet(io.BytesIO(body), engine="pyarrow")
+        return {
+            symbol: group.drop(columns="Symbol")
+            for symbol, group in combined.groupby("Symbol", sort=False)
+        }
+
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    return {
+        symbol: pd.DataFrame.from_dict(rows, orient="index")
+        for symbol, rows in json.loads(body).items()
+    }
+
+def is_batch_key(key):
+    """raw/YYYY/MM/DD/batch-HHMMSS.parquet holds many symbols"""
+    return key.split("/")[-1].startswith("batch-")
+
+def decode_frame(body, key):
+    """Reads a raw-zone object back into a DataFrame, based on the key's extension"""
+    if key.endswith(".parquet"):
+        return pd.read_parquet(io.BytesIO(body), engine="pyarrow")
+
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    return pd.DataFrame.from_dict(json.loads(body), orient="index")
+
+def symbol_from_key(key):
+    """raw/YYYY/MM/DD/TSLA.parquet -> TSLA"""
+    name = key.split("/")[-1]
+    for spec in FORMATS.values():
+        if name.endswith(spec["extension"]):
+            return name[:-len(spec["extension"])]
+    return name
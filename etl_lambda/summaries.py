@@ -0,0 +1,99 @@
+# Small derived tables the dashboard reads instead of recomputing from daily_prices.
+# The processor refreshes them incrementally: only the symbols it just loaded,
+# and only from the earliest date it loaded for each.
+
+CREATE_SUMMARY_TABLES = """
+CREATE TABLE IF NOT EXISTS symbol_snapshot (
+    symbol VARCHAR(20) PRIMARY KEY,
+    date DATE NOT NULL,
+    close DECIMAL(10, 2),
+    prev_close DECIMAL(10, 2),
+    pct_change DOUBLE PRECISION,
+    high_52w DECIMAL(10, 2),
+    low_52w DECIMAL(10, 2),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS ohlc_rollups (
+    symbol VARCHAR(20) NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_start DATE NOT NULL,
+    open DECIMAL(10, 2),
+    high DECIMAL(10, 2),
+    low DECIMAL(10, 2),
+    close DECIMAL(10, 2),
+    volume BIGINT,
+    PRIMARY KEY (symbol, period, period_start)
+);
+"""
+
+# One per candle size the dashboard draws above daily (downsample.OHLC_RULES)
+ROLLUP_PERIODS = ["week", "month", "quarter", "year"]
+
+# (symbol, since) pairs passed in as two parallel arrays
+LOADED_CTE = "loaded(symbol, since) AS (SELECT * FROM unnest(%(symbols)s::text[], %(since)s::date[]))"
+
+REFRESH_ROLLUPS = f"""
+WITH {LOADED_CTE}
+INSERT INTO ohlc_rollups (symbol, period, period_start, open, high, low, close, volume)
+SELECT d.symbol, %(period)s, date_trunc(%(period)s, d.date::timestamp)::date AS period_start,
+       (array_agg(d.open ORDER BY d.date))[1],
+       MAX(d.high), MIN(d.low),
+       (array_agg(d.close ORDER BY d.date DESC))[1],
+       SUM(d.volume)
+FROM daily_prices d
+-- Whole periods only: a new Tuesday bar rebuilds that week from its Monday
+JOIN loaded l ON l.symbol = d.symbol AND d.date >= date_trunc(%(period)s, l.since::timestamp)::date
+GROUP BY d.symbol, period_start
+ON CONFLICT (symbol, period, period_start) DO UPDATE
+SET open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low,
+    close = EXCLUDED.close, volume = EXCLUDED.volume;
+"""
+
+REFRESH_SNAPSHOT = """
+INSERT INTO symbol_snapshot (symbol, date, close, prev_close, pct_change, high_52w, low_52w, updated_at)
+SELECT s.symbol, latest.date, latest.close, prev.close,
+       (latest.close - prev.close) / NULLIF(prev.close, 0) * 100,
+       w.high_52w, w.low_52w, CURRENT_TIMESTAMP
+FROM unnest(%(symbols)s::text[]) AS s(symbol)
+CROSS JOIN LATERAL (
+    SELECT date, close FROM daily_prices
+    WHERE symbol = s.symbol ORDER BY date DESC LIMIT 1
+) latest
+LEFT JOIN LATERAL (
+    SELECT close FROM daily_prices
+    WHERE symbol = s.symbol AND date < latest.date ORDER BY date DESC LIMIT 1
+) prev ON TRUE
+CROSS JOIN LATERAL (
+    SELECT MAX(high) AS high_52w, MIN(low) AS low_52w FROM daily_prices
+    WHERE symbol = s.symbol AND date > latest.date - 365
+) w
+ON CONFLICT (symbol) DO UPDATE
+SET date = EXCLUDED.date, close = EXCLUDED.close, prev_close = EXCLUDED.prev_close,
+    pct_change = EXCLUDED.pct_change, high_52w = EXCLUDED.high_52w,
+    low_52w = EXCLUDED.low_52w, updated_at = EXCLUDED.updated_at;
+"""
+
+def create_summary_tables(cursor):
+    cursor.execute(CREATE_SUMMARY_TABLES)
+    # Nothing ever read it: symbol_snapshot carries the latest return
+    cursor.execute("DROP TABLE IF EXISTS daily_returns;")
+
+def refresh_summaries(cursor, loaded):
+    """
+    Brings every summary table up to date for `loaded` = {symbol: earliest date loaded}.
+    One set-based statement per rollup period plus one for the snapshot, whatever the
+    number of symbols.
+    """
+    if not loaded:
+        return
+    params = {"symbols": list(loaded), "since": [str(since) for since in loaded.values()]}
+
+    for period in ROLLUP_PERIODS:
+        cursor.execute(REFRESH_ROLLUPS, {**params, "period": period})
+    cursor.execute(REFRESH_SNAPSHOT, params)
+
+def rebuild_summaries(cursor):
+    """Full refresh from each symbol's first stored bar: fills in rollup periods added later"""
+    cursor.execute("SELECT symbol, MIN(date) FROM daily_prices GROUP BY symbol;")
+    refresh_summaries(cursor, dict(cursor.fetchall()))
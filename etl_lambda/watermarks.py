@@ -0,0 +1,181 @@
+from datetime import date, timedelta
+
+# Holes in a symbol's series wider than this (calendar days) are treated as missing data.
+# A weekend plus a long holiday (e.g. Eid on Tadawul) stays under it.
+GAP_THRESHOLD_DAYS = 10
+
+# How far back gap detection looks. Older holes are the backfill's job.
+GAP_LOOKBACK_DAYS = 365
+
+# A gap a fetch came back empty for (trading halt, suspension, a stretch Yahoo never had)
+# is recorded in known_gaps and left out of planning until it is this old, then tried again.
+GAP_RECHECK_DAYS = 30
+
+CREATE_KNOWN_GAPS_TABLE = """
+CREATE TABLE IF NOT EXISTS known_gaps (
+    symbol VARCHAR(20) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, start_date, end_date)
+);
+"""
+
+# Yahoo only serves recent intraday history: ~7 days of 1m bars, 60 days of other
+# sub-hourly intervals, 730 of hourly. Intraday windows never reach further back.
+INTRADAY_LOOKBACK_DAYS = {"1m": 7, "2m": 60, "5m": 60, "15m": 60, "30m": 60, "90m": 60, "60m": 730, "1h": 730}
+
+def get_high_water_marks(cursor, symbols):
+    """Latest stored date per symbol: {symbol: date}. Symbols with no rows are absent."""
+    cursor.execute("""
+        SELECT symbol, MAX(date)
+        FROM daily_prices
+        WHERE symbol = ANY(%s)
+        GROUP BY symbol;
+    """, (list(symbols),))
+    return dict(cursor.fetchall())
+
+def get_stored_ranges(cursor, symbols):
+    """First and latest stored date per symbol: {symbol: (first, last)}. Symbols with no rows are absent."""
+    cursor.execute("""
+        SELECT symbol, MIN(date), MAX(date)
+        FROM daily_prices
+        WHERE symbol = ANY(%s)
+        GROUP BY symbol;
+    """, (list(symbols),))
+    return {symbol: (first, last) for symbol, first, last in cursor.fetchall()}
+
+def create_known_gaps_table(cursor):
+    cursor.execute(CREATE_KNOWN_GAPS_TABLE)
+
+def has_known_gaps_table(cursor):
+    cursor.execute("SELECT to_regclass('known_gaps') IS NOT NULL;")
+    return cursor.fetchone()[0]
+
+def record_empty_gaps(cursor, gaps):
+    """Marks (symbol, start, end) gaps as fetched-and-empty, so planning skips them for a while"""
+    if not gaps:
+        return 0
+    create_known_gaps_table(cursor)
+    cursor.executemany("""
+        INSERT INTO known_gaps (symbol, start_date, end_date)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (symbol, start_date, end_date) DO UPDATE SET checked_at = CURRENT_TIMESTAMP;
+    """, gaps)
+    return len(gaps)
+
+def find_gaps(cursor, symbols, since, threshold_days=GAP_THRESHOLD_DAYS):
+    """
+    Missing stretches since `since`: {symbol: [(first_missing_date, next_stored_date)]}.
+    Gaps recorded in known_gaps within the last GAP_RECHECK_DAYS are left out.
+    """
+    known = ""
+    if has_known_gaps_table(cursor):
+        known = f"""
+          AND NOT EXISTS (
+              SELECT 1 FROM known_gaps k
+              WHERE k.symbol = t.symbol AND k.start_date = t.prev_date + 1 AND k.end_date = t.date
+                AND k.checked_at > CURRENT_TIMESTAMP - INTERVAL '{GAP_RECHECK_DAYS} days'
+          )"""
+    cursor.execute(f"""
+        SELECT symbol, prev_date, date
+        FROM (
+            SELECT symbol, date,
+                   LAG(date) OVER (PARTITION BY symbol ORDER BY date) AS prev_date
+            FROM daily_prices
+            WHERE symbol = ANY(%s) AND date >= %s
+        ) t
+        WHERE date - prev_date > %s{known}
+        ORDER BY symbol, date;
+    """, (list(symbols), since, threshold_days))
+
+    gaps = {}
+    for symbol, prev_date, next_date in cursor.fetchall():
+        gaps.setdefault(symbol, []).append((prev_date + timedelta(days=1), next_date))
+    return gaps
+
+def plan_windows(symbol, watermarks, gaps, default_period, today=None):
+    """
+    Turns a symbol's watermark and gaps into Ticker.history() kwargs.
+    Unknown symbols get `default_period`; known ones fetch from the day after
+    their last stored bar, plus one window per gap (yfinance's `end` is exclusive).
+    Returns [] when the symbol is already up to date.
+    """
+    today = today or date.today()
+    last_date = watermarks.get(symbol)
+
+    if last_date is None:
+        return [{"period": default_period}]
+
+    windows = [{"start": start, "end": end} for start, end in gaps.get(symbol, [])]
+    if last_date < today:
+        windows.append({"start": last_date + timedelta(days=1)})
+    return windows
+
+def load_plan(cursor, symbols, default_period, today=None):
+    """Watermarks + gap scan for a whole watchlist in two queries: {symbol: [window kwargs]}"""
+    today = today or date.today()
+    watermarks = get_high_water_marks(cursor, symbols)
+    gaps = find_gaps(cursor, symbols, today - timedelta(days=GAP_LOOKBACK_DAYS))
+    return {
+        symbol: plan_windows(symbol, watermarks, gaps, default_period, today)
+        for symbol in symbols
+    }
+
+def missing_ranges(cursor, symbols, since, today=None, threshold_days=GAP_THRESHOLD_DAYS):
+    """
+    What daily_prices lacks since `since`: {symbol: [(start, end)]}, `end` exclusive.
+    Covers the stretch before a symbol's first stored bar (when wider than the gap
+    threshold), the gaps in between and everything after its latest bar.
+    """
+    today = today or date.today()
+    stored = get_stored_ranges(cursor, symbols)
+    gaps = find_gaps(cursor, symbols, since, threshold_days)
+
+    ranges = {}
+    for symbol in symbols:
+        if symbol not in stored:
+            ranges[symbol] = [(since, today + timedelta(days=1))]
+            continue
+        first, last = stored[symbol]
+        missing = []
+        if (first - since).days > threshold_days:
+            missing.append((since, first))
+        missing.extend(gaps.get(symbol, []))
+        if last < today:
+            missing.append((last + timedelta(days=1), today + timedelta(days=1)))
+        ranges[symbol] = missing
+    return ranges
+
+def get_intraday_water_marks(cursor, symbols, interval):
+    """Latest stored bar per symbol for one interval: {symbol: datetime}. Symbols with no bars are absent."""
+    cursor.execute("""
+        SELECT symbol, MAX(ts)
+        FROM intraday_prices
+        WHERE symbol = ANY(%s) AND interval = %s
+        GROUP BY symbol;
+    """, (list(symbols), interval))
+    return dict(cursor.fetchall())
+
+def plan_intraday_windows(symbol, watermarks, interval, default_period, today=None):
+    """
+    Ticker.history() kwargs from a symbol's latest stored bar for `interval`. The window
+    starts on that bar's day, so a run that was missed is caught up and the bar that was
+    still forming last time is fetched again, clipped to what Yahoo still serves.
+    """
+    today = today or date.today()
+    last_ts = watermarks.get(symbol)
+
+    if last_ts is None:
+        return [{"period": default_period}]
+
+    earliest = today - timedelta(days=INTRADAY_LOOKBACK_DAYS.get(interval, 60) - 1)
+    return [{"start": max(last_ts.date(), earliest)}]
+
+def load_intraday_plan(cursor, symbols, interval, default_period, today=None):
+    """Intraday watermarks for a whole watchlist in one query: {symbol: [window kwargs]}"""
+    watermarks = get_intraday_water_marks(cursor, symbols, interval)
+    return {
+        symbol: plan_intraday_windows(symbol, watermarks, interval, default_period, today)
+        for symbol in symbols
+    }
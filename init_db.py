@@ -1,5 +1,14 @@
+import sys
 import psycopg2
+from datetime import date
 from etl_lambda.aws_secrets import get_secrets
+from etl_lambda.partitions import (
+    create_indexes, create_partitioned_table, create_intraday_table, create_ticks_table, ensure_future_daily_partitions,
+    ensure_future_intraday_partitions, ensure_future_tick_partitions, detach_partitions_before, is_partitioned,
+    migrate_to_partitioned
+)
+from etl_lambda.summaries import create_summary_tables, rebuild_summaries
+from etl_lambda.watermarks import create_known_gaps_table
 
 # --- CONFIGURATION ---
 print("🔐 Fetching credentials from AWS Secrets Manager...")
@@ -27,29 +36,64 @@ def init_database():
             password=DB_PASS,
             port=5432
         )
-        conn.autocommit = True
+        # Each step below commits as a unit, so a failed migration leaves nothing half-done
         cursor = conn.cursor()
         print("   ✅ Connected successfully!")
 
-        # SQL to create the table
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS daily_prices (
-            symbol VARCHAR(20) NOT NULL,
-            date DATE NOT NULL,
-            open DECIMAL(10, 2),
-            high DECIMAL(10, 2),
-            low DECIMAL(10, 2),
-            close DECIMAL(10, 2),
-            volume BIGINT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (symbol, date)
-        );
-        """
-
-        print("2. Creating table 'daily_prices'...")
-        cursor.execute(create_table_query)
+        cursor.execute("SELECT to_regclass('daily_prices') IS NOT NULL;")
+        exists = cursor.fetchone()[0]
+
+        if not exists:
+            # Range-partitioned by date: queries and vacuum only touch the partitions they need
+            print("2. Creating partitioned table 'daily_prices'...")
+            create_partitioned_table(cursor)
+            conn.commit()
+            print("   ✅ Table created!")
+        elif not is_partitioned(cursor):
+            print("2. Migrating heap table 'daily_prices' to a partitioned table...")
+            rows = migrate_to_partitioned(cursor)
+            conn.commit()
+            print(f"   ✅ Migrated {rows} rows. The old table is kept as 'daily_prices_legacy'.")
+        else:
+            print("2. Table 'daily_prices' already exists (partitioned).")
+            # Tables created before an index was added pick it up here
+            create_indexes(cursor)
+            conn.commit()
+
+        # Intraday (1m/5m/...) bars: timestamp-keyed, partitioned monthly
+        print("3. Creating table 'intraday_prices'...")
+        create_intraday_table(cursor)
+        conn.commit()
+        print("   ✅ Table created (or already exists)!")
+
+        # Raw trades from the streaming ingester (stream_ticks.py)
+        print("3b. Creating table 'ticks'...")
+        create_ticks_table(cursor)
+        conn.commit()
+        print("   ✅ Table created (or already exists)!")
+
+        # Derived tables the processor keeps current for the dashboard
+        print("4. Creating summary tables...")
+        create_summary_tables(cursor)
+        # Existing history gets every rollup period, not just what the processor loads from now on
+        rebuild_summaries(cursor)
+        conn.commit()
+        print("   ✅ symbol_snapshot, ohlc_rollups ready!")
+
+        # Gaps the ingest found Yahoo has no data for, so it stops refetching them
+        print("4b. Creating table 'known_gaps'...")
+        create_known_gaps_table(cursor)
+        conn.commit()
         print("   ✅ Table created (or already exists)!")
 
+        print("5. Pre-creating partitions...")
+        created = (
+            ensure_future_daily_partitions(cursor) + ensure_future_intraday_partitions(cursor)
+            + ensure_future_tick_partitions(cursor)
+        )
+        conn.commit()
+        print(f"   ✅ Created: {created or 'none needed'}")
+
         cursor.close()
         conn.close()
         print("\n🎉 Database is ready for data!")
@@ -59,5 +103,32 @@ def init_database():
         print(e)
         print("\nTroubleshooting Tip: Check your AWS Security Group and Secrets Manager permissions.")
 
+def maintain_partitions(detach_before_year=None):
+    """Scheduled upkeep: pre-create future partitions, optionally detach old ones"""
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS, port=5432)
+    cursor = conn.cursor()
+
+    # Cheap when the indexes exist; adds any that older tables are missing
+    create_indexes(cursor)
+    created = (
+        ensure_future_daily_partitions(cursor) + ensure_future_intraday_partitions(cursor)
+        + ensure_future_tick_partitions(cursor)
+    )
+    conn.commit()
+    print(f"🧱 Created partitions: {created or 'none needed'}")
+
+    if detach_before_year:
+        detached = detach_partitions_before(cursor, date(detach_before_year, 1, 1))
+        conn.commit()
+        print(f"📦 Detached partitions: {detached or 'none'}")
+
+    cursor.close()
+    conn.close()
+
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    # python init_db.py                  -> create (or migrate) the schema
+    # python init_db.py maintain [YEAR]  -> pre-create partitions, detach those before YEAR
+    if len(sys.argv) > 1 and sys.argv[1] == "maintain":
+        maintain_partitions(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        init_database()
\ No newline at end of file
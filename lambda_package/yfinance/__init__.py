@@ -25,7 +25,9 @@ from .lookup import Lookup
 from .ticker import Ticker
 from .calendars import Calendars
 from .tickers import Tickers
+from .scrapers.quote import quote_snapshot
 from .multi import download
+from .multi_async import download_async, iter_download_async
 from .live import WebSocket, AsyncWebSocket
 from .utils import enable_debug_mode
 from .cache import set_tz_cache_location
@@ -43,7 +45,7 @@ __author__ = "Ran Aroussi"
 import warnings
 warnings.filterwarnings('default', category=DeprecationWarning, module='^yfinance')
 
-__all__ = ['download', 'Market', 'Search', 'Lookup', 'Ticker', 'Tickers', 'enable_debug_mode', 'set_tz_cache_location', 'Sector', 'Industry', 'WebSocket', 'AsyncWebSocket', 'Calendars']
+__all__ = ['download', 'download_async', 'iter_download_async', 'Market', 'Search', 'Lookup', 'Ticker', 'Tickers', 'quote_snapshot', 'enable_debug_mode', 'set_tz_cache_location', 'Sector', 'Industry', 'WebSocket', 'AsyncWebSocket', 'Calendars']
 # screener stuff:
 __all__ += ['EquityQuery', 'FundQuery', 'screen', 'PREDEFINED_SCREENER_QUERIES']
 
@@ -5,7 +5,12 @@ import platformdirs as _ad
 import atexit as _atexit
 import datetime as _dt
 import pickle as _pkl
+import hashlib as _hashlib
+import json as _json
+import time as _time
+from collections import OrderedDict as _OrderedDict
 
+from .config import YfConfig
 from .utils import get_yf_logger
 
 _cache_init_lock = Lock()
@@ -618,6 +623,302 @@ def get_isin_cache():
     return _ISINCacheManager.get_isin_cache()
 
 
+# --------------
+# Response cache
+# --------------
+
+# Seconds a response stays fresh, by endpoint: the first fragment found in the URL wins.
+# cache_get() uses _RESPONSE_TTL_DEFAULT for anything else; get_raw_json() only caches listed endpoints.
+# Override or extend with yf.config.cache.response_ttls = {'fragment': seconds}.
+_RESPONSE_TTLS = {
+    '/v10/finance/quoteSummary': 15 * 60,
+    'fundamentals-timeseries': 24 * 60 * 60,
+    # Only timezone lookups and date ranges already in the past go through cache_get()
+    '/v8/finance/chart': 24 * 60 * 60,
+    '/v1/finance/search': 60 * 60,
+    'calendar/earnings': 60 * 60,
+}
+_RESPONSE_TTL_DEFAULT = 5 * 60
+
+# Fallback when the cache folder is unusable: a small in-memory LRU, as before
+_RESPONSE_MEMORY_MAXSIZE = 64
+
+
+def response_ttl(url, default=_RESPONSE_TTL_DEFAULT):
+    ttls = {**_RESPONSE_TTLS, **(YfConfig.cache.response_ttls or {})}
+    for fragment, ttl in ttls.items():
+        if fragment in url:
+            return ttl
+    return default
+
+
+def response_key(url, params=None):
+    params = _json.dumps(dict(params or {}), sort_keys=True, default=str)
+    return _hashlib.sha256(f"{url}|{params}".encode()).hexdigest()
+
+
+class CachedResponse:
+    """Stands in for a curl_cffi Response rebuilt from the response cache"""
+
+    def __init__(self, url, status_code, content, etag=None, last_modified=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {k: v for k, v in (('ETag', etag), ('Last-Modified', last_modified)) if v}
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self, **kwargs):
+        return _json.loads(self.content, **kwargs)
+
+    def raise_for_status(self):
+        # Only successful responses are stored
+        pass
+
+
+class _ResponseCacheException(Exception):
+    pass
+
+
+class _ResponseCacheManager:
+    _response_cache = None
+
+    @classmethod
+    def get_response_cache(cls):
+        if cls._response_cache is None:
+            with _cache_init_lock:
+                cls._initialise()
+        return cls._response_cache
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        cls._response_cache = _ResponseCache()
+
+
+class _ResponseDBManager:
+    _db = None
+    _cache_dir = _os.path.join(_ad.user_cache_dir(), "py-yfinance")
+
+    @classmethod
+    def get_database(cls):
+        if cls._db is None:
+            cls._initialise()
+        return cls._db
+
+    @classmethod
+    def close_db(cls):
+        if cls._db is not None:
+            try:
+                cls._db.close()
+            except Exception:
+                # Must discard exceptions because Python trying to quit.
+                pass
+
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        if cache_dir is not None:
+            cls._cache_dir = cache_dir
+
+        if not _os.path.isdir(cls._cache_dir):
+            try:
+                _os.makedirs(cls._cache_dir)
+            except OSError as err:
+                raise _ResponseCacheException(f"Error creating ResponseCache folder: '{cls._cache_dir}' reason: {err}")
+        elif not (_os.access(cls._cache_dir, _os.R_OK) and _os.access(cls._cache_dir, _os.W_OK)):
+            raise _ResponseCacheException(f"Cannot read and write in ResponseCache folder: '{cls._cache_dir}'")
+
+        cls._db = _peewee.SqliteDatabase(
+            _os.path.join(cls._cache_dir, 'responses.db'),
+            pragmas={'journal_mode': 'wal', 'cache_size': -64}
+        )
+
+    @classmethod
+    def set_location(cls, new_cache_dir):
+        if cls._db is not None:
+            cls._db.close()
+            cls._db = None
+        cls._cache_dir = new_cache_dir
+
+    @classmethod
+    def get_location(cls):
+        return cls._cache_dir
+
+# close DB when Python exists
+_atexit.register(_ResponseDBManager.close_db)
+
+
+response_db_proxy = _peewee.Proxy()
+class _ResponseSchema(_peewee.Model):
+    key = _peewee.CharField(primary_key=True)
+    url = _peewee.TextField()
+    status_code = _peewee.IntegerField()
+    etag = _peewee.CharField(null=True)
+    last_modified = _peewee.CharField(null=True)
+    content = _peewee.BlobField()
+    size = _peewee.IntegerField()
+    # Unix timestamps
+    expires_at = _peewee.FloatField()
+    accessed_at = _peewee.FloatField(index=True)
+
+    class Meta:
+        database = response_db_proxy
+        without_rowid = True
+
+
+class _ResponseCache:
+    """
+    Persistent HTTP response cache for YfData: per-endpoint freshness, ETag/Last-Modified
+    revalidation once stale, and least-recently-used eviction past yf.config.cache.response_max_mb.
+    """
+
+    def __init__(self):
+        self.initialised = -1
+        self.db = None
+        self.dummy = False
+        self._memory = _OrderedDict()
+        self._memory_lock = Lock()
+
+    def get_db(self):
+        if self.db is not None:
+            return self.db
+
+        try:
+            self.db = _ResponseDBManager.get_database()
+        except _ResponseCacheException as err:
+            get_yf_logger().info(f"Failed to create ResponseCache, reason: {err}. "
+                                 "ResponseCache will only be kept in memory. "
+                                 "Tip: You can direct cache to use a different location with 'set_cache_location(mylocation)'")
+            self.dummy = True
+            return None
+        return self.db
+
+    def initialise(self):
+        if self.initialised != -1:
+            return
+
+        db = self.get_db()
+        if db is None:
+            self.initialised = 0  # failure
+            return
+
+        db.connect(reuse_if_open=True)
+        response_db_proxy.initialize(db)
+        try:
+            db.create_tables([_ResponseSchema])
+        except _peewee.OperationalError as e:
+            if 'WITHOUT' in str(e):
+                _ResponseSchema._meta.without_rowid = False
+                db.create_tables([_ResponseSchema])
+            else:
+                raise
+        self.initialised = 1  # success
+
+    def _persistent(self):
+        if self.dummy:
+            return False
+        if self.initialised == -1:
+            self.initialise()
+        return self.initialised == 1
+
+    def lookup(self, key):
+        """
+        Returns (response, fresh) or None. A stale entry is still returned so the
+        caller can revalidate it with its ETag/Last-Modified.
+        """
+        now = _time.time()
+        if not self._persistent():
+            with self._memory_lock:
+                entry = self._memory.get(key)
+                if entry is None:
+                    return None
+                self._memory.move_to_end(key)
+            response, expires_at = entry
+            return response, expires_at > now
+
+        try:
+            row = _ResponseSchema.get(_ResponseSchema.key == key)
+        except _ResponseSchema.DoesNotExist:
+            return None
+        _ResponseSchema.update(accessed_at=now).where(_ResponseSchema.key == key).execute()
+        response = CachedResponse(row.url, row.status_code, bytes(row.content), row.etag, row.last_modified)
+        return response, row.expires_at > now
+
+    def store(self, key, response, ttl):
+        now = _time.time()
+        cached = CachedResponse(
+            response.url, response.status_code, response.content,
+            response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+        if not self._persistent():
+            with self._memory_lock:
+                self._memory[key] = (cached, now + ttl)
+                self._memory.move_to_end(key)
+                while len(self._memory) > _RESPONSE_MEMORY_MAXSIZE:
+                    self._memory.popitem(last=False)
+            return cached
+
+        with self.get_db().atomic():
+            _ResponseSchema.replace(
+                key=key, url=cached.url, status_code=cached.status_code,
+                etag=cached.headers.get('ETag'), last_modified=cached.headers.get('Last-Modified'),
+                content=cached.content, size=len(cached.content),
+                expires_at=now + ttl, accessed_at=now,
+            ).execute()
+        self._evict()
+        return cached
+
+    def refresh(self, key, ttl):
+        """Server confirmed (304) the stored response is still current"""
+        now = _time.time()
+        if not self._persistent():
+            with self._memory_lock:
+                if key in self._memory:
+                    self._memory[key] = (self._memory[key][0], now + ttl)
+            return
+        _ResponseSchema.update(expires_at=now + ttl, accessed_at=now).where(_ResponseSchema.key == key).execute()
+
+    def _evict(self):
+        max_bytes = (YfConfig.cache.response_max_mb or 0) * 1024 * 1024
+        if max_bytes <= 0:
+            return
+        total = _ResponseSchema.select(_peewee.fn.SUM(_ResponseSchema.size)).scalar() or 0
+        if total <= max_bytes:
+            return
+
+        # Drop least recently used until 10% under the limit, so eviction isn't run on every store
+        excess = total - int(max_bytes * 0.9)
+        keys = []
+        query = (_ResponseSchema
+                 .select(_ResponseSchema.key, _ResponseSchema.size)
+                 .order_by(_ResponseSchema.accessed_at))
+        for row in query.iterator():
+            keys.append(row.key)
+            excess -= row.size
+            if excess <= 0:
+                break
+        with self.get_db().atomic():
+            _ResponseSchema.delete().where(_ResponseSchema.key.in_(keys)).execute()
+        get_yf_logger().debug(f"ResponseCache evicted {len(keys)} responses")
+
+    def clear(self):
+        with self._memory_lock:
+            self._memory.clear()
+        if self._persistent():
+            _ResponseSchema.delete().execute()
+
+
+def get_response_cache():
+    return _ResponseCacheManager.get_response_cache()
+
+
 # --------------
 # Utils
 # --------------
@@ -633,6 +934,7 @@ def set_cache_location(cache_dir: str):
     _TzDBManager.set_location(cache_dir)
     _CookieDBManager.set_location(cache_dir)
     _ISINDBManager.set_location(cache_dir)
+    _ResponseDBManager.set_location(cache_dir)
 
 def set_tz_cache_location(cache_dir: str):
     set_cache_location(cache_dir)
@@ -30,9 +30,17 @@ class ConfigMgr:
         n = self.__getattr__('network')
         n.proxy = None
         n.retries = 0
+        # Process-wide request throttle, see throttle.py
+        n.rate_limit = 10
+        n.burst = 20
+        n.max_concurrency = 16
+        n.rate_limit_retries = 3
         d = self.__getattr__('debug')
         d.hide_exceptions = True
         d.logging = False
+        c = self.__getattr__('cache')
+        c.response_ttls = {}
+        c.response_max_mb = 64
 
     def __getattr__(self, key):
         if not self._initialised:
@@ -11,6 +11,7 @@ import datetime
 from frozendict import frozendict
 
 from . import utils, cache
+from .throttle import get_throttle, get_request_stats
 from .config import YfConfig
 import threading
 
@@ -371,8 +372,8 @@ class YfData(metaclass=SingletonMeta):
         return crumb, strategy
 
     @utils.log_indent_decorator
-    def get(self, url, params=None, timeout=30):
-        response = self._make_request(url, request_method = self._session.get, params=params, timeout=timeout)
+    def get(self, url, params=None, timeout=30, headers=None):
+        response = self._make_request(url, request_method = self._session.get, params=params, timeout=timeout, headers=headers)
 
         # Accept cookie-consent if redirected to consent page
         if not self._is_this_consent_url(response.url):
@@ -389,7 +390,7 @@ class YfData(metaclass=SingletonMeta):
         return self._make_request(url, request_method = self._session.post, body=body, params=params, timeout=timeout, data=data)
 
     @utils.log_indent_decorator
-    def _make_request(self, url, request_method, body=None, params=None, timeout=30, data=None):
+    def _make_request(self, url, request_method, body=None, params=None, timeout=30, data=None, headers=None):
         # Important: treat input arguments as immutable.
 
         if len(url) > 200:
@@ -425,9 +426,12 @@ class YfData(metaclass=SingletonMeta):
             request_args['data'] = data
             request_args['headers'] = {"Content-Type": "application/json"}
 
+        if headers:
+            request_args['headers'] = {**request_args.get('headers', {}), **headers}
+
         for attempt in range(YfConfig.network.retries + 1):
             try:
-                response = request_method(**request_args)
+                response = self._throttled_request(request_method, request_args)
                 break
             except Exception as e:
                 if _is_transient_error(e) and attempt < YfConfig.network.retries:
@@ -443,23 +447,78 @@ class YfData(metaclass=SingletonMeta):
                 self._set_cookie_strategy('basic')
             crumb, strategy = self._get_cookie_and_crumb(timeout)
             request_args['params']['crumb'] = crumb
-            response = request_method(**request_args)
+            response = self._throttled_request(request_method, request_args)
             utils.get_yf_logger().debug(f'response code={response.status_code}')
 
-            # Raise exception if rate limited
+            # Rate limited: the throttle has paused and cut concurrency, so waiting for a slot is the backoff
+            for _ in range(YfConfig.network.rate_limit_retries or 0):
+                if response.status_code != 429:
+                    break
+                response = self._throttled_request(request_method, request_args)
+                utils.get_yf_logger().debug(f'response code={response.status_code}')
+
+            # Raise exception if still rate limited
             if response.status_code == 429:
                 raise YFRateLimitError()
 
         return response
 
-    @lru_cache_freezeargs
-    @lru_cache(maxsize=cache_maxsize)
+    def _throttled_request(self, request_method, request_args):
+        throttle = get_throttle()
+        throttle.acquire()
+        response = None
+        failed = True
+        try:
+            response = request_method(**request_args)
+            failed = False
+        finally:
+            throttle.release(response, failed=failed)
+        return response
+
+    def request_stats(self):
+        """Request rate, 429s, queueing delay and current limits of the shared throttle"""
+        return get_request_stats()
+
     def cache_get(self, url, params=None, timeout=30):
-        return self.get(url, params, timeout)
+        return self._cached_get(url, params, timeout, cache.response_ttl(url))
+
+    @utils.log_indent_decorator
+    def _cached_get(self, url, params, timeout, ttl):
+        """
+        GET through the persistent response cache. Fresh hits never reach Yahoo;
+        stale entries are revalidated with If-None-Match/If-Modified-Since.
+        """
+        response_cache = cache.get_response_cache()
+        key = cache.response_key(url, params)
+
+        entry = response_cache.lookup(key)
+        headers = {}
+        if entry is not None:
+            cached, fresh = entry
+            if fresh:
+                utils.get_yf_logger().debug('response cache hit')
+                return cached
+            if 'ETag' in cached.headers:
+                headers['If-None-Match'] = cached.headers['ETag']
+            if 'Last-Modified' in cached.headers:
+                headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+        response = self.get(url, params, timeout, headers=headers or None)
+        if response.status_code == 304 and entry is not None:
+            utils.get_yf_logger().debug('response cache revalidated')
+            response_cache.refresh(key, ttl)
+            return entry[0]
+        if response.status_code == 200 and "Will be right back" not in response.text:
+            response_cache.store(key, response, ttl)
+        return response
 
     def get_raw_json(self, url, params=None, timeout=30):
         utils.get_yf_logger().debug(f'get_raw_json(): {url}')
-        response = self.get(url, params=params, timeout=timeout)
+        ttl = cache.response_ttl(url, default=None)
+        if ttl is None:
+            response = self.get(url, params=params, timeout=timeout)
+        else:
+            response = self._cached_get(url, params, timeout, ttl)
         response.raise_for_status()
         return response.json()
 
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+asyncio bulk history: one pooled curl_cffi AsyncSession, a bounded number of chart requests
+in flight, each response parsed as soon as it lands. Results and errors are returned (or
+yielded) per ticker and never written to shared._DFS/_ERRORS.
+
+    frames = await yf.download_async(["AAPL", "MSFT"], period="5d")
+
+    async for ticker, df in yf.iter_download_async(tickers, interval="1m", period="1d"):
+        ...  # df is an Exception if that ticker failed
+
+Requests are planned and responses parsed by PriceHistory itself (_history_request and
+_process_history), so frames match Ticker.history for the same arguments; only the chart GET
+is async. Shares the cookie/crumb, the request throttle and the response cache with YfData.
+Price repair makes blocking follow-up fetches, so with repair=True parsing runs in a worker thread.
+"""
+
+import asyncio
+import time as _time
+from functools import partial
+
+from curl_cffi.requests import AsyncSession
+
+from . import Ticker, cache, utils
+from .config import YfConfig
+from .const import _BASE_URL_
+from .data import YfData, _is_transient_error
+from .exceptions import YFDataException, YFRateLimitError
+from .scrapers.history import PriceHistory
+from .throttle import get_throttle
+
+# Ranges ending this long ago are final, so safe to serve from the response cache (as PriceHistory)
+_DATA_DELAY = 1800
+
+
+def _ticker_list(tickers):
+    tickers = tickers if isinstance(
+        tickers, (list, set, tuple)) else tickers.replace(',', ' ').split()
+    return list(dict.fromkeys(ticker.upper() for ticker in tickers))
+
+
+def _needs_tz(period, interval, start, end, repair):
+    """Whether PriceHistory needs the exchange timezone to build the request (as in history())"""
+    return bool(start or end or (period and period.lower() == "max")
+                or (repair and interval in ("5d", "1wk", "1mo", "3mo")))
+
+
+async def _price_history(data, ticker, needs_tz, timeout):
+    tz = None
+    if needs_tz:
+        # Usually a tz-cache hit; otherwise one blocking lookup, kept off the event loop
+        tz = await asyncio.to_thread(Ticker(ticker)._get_ticker_tz, timeout)
+    # Results and errors go back to the caller, not into download()'s shared._DFS/_ERRORS
+    return PriceHistory(data, ticker, tz, shared_errors=False)
+
+
+async def _fetch_chart(session, url, params, crumb, timeout, cacheable):
+    """GET one chart through the shared throttle, with YfData's retry rules. Returns decoded JSON."""
+    response_cache = cache.get_response_cache()
+    key = cache.response_key(url, params)
+    if cacheable:
+        entry = response_cache.lookup(key)
+        if entry is not None and entry[1]:
+            return entry[0].json()
+
+    throttle = get_throttle()
+    request_params = {**params, 'crumb': crumb} if crumb is not None else params
+    failures = throttled = 0
+    while True:
+        await throttle.acquire_async()
+        response = None
+        try:
+            response = await session.get(url, params=request_params, timeout=timeout)
+        except Exception as e:
+            if not _is_transient_error(e) or failures >= YfConfig.network.retries:
+                raise
+            await asyncio.sleep(2 ** failures)
+            failures += 1
+            continue
+        finally:
+            throttle.release_async(response)
+
+        if response.status_code != 429:
+            break
+        # The throttle has paused the shared bucket, so the next acquire is the backoff
+        if throttled >= (YfConfig.network.rate_limit_retries or 0):
+            raise YFRateLimitError()
+        throttled += 1
+
+    if "Will be right back" in response.text:
+        raise YFDataException("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***")
+    if cacheable and response.status_code == 200:
+        response_cache.store(key, response, cache.response_ttl(url))
+    # Unknown tickers come back 404 with the reason in the JSON body
+    return response.json()
+
+
+async def iter_download_async(tickers, start=None, end=None, actions=False, period=None,
+                              interval="1d", prepost=False, auto_adjust=True, back_adjust=False,
+                              repair=False, keepna=False, rounding=False, timeout=10, concurrency=None):
+    """
+    Yields (ticker, DataFrame) in completion order; the frame is an Exception if that ticker failed.
+    Arguments as download(), plus:
+        concurrency: int
+            Chart requests in flight. Default: yf.config.network.max_concurrency
+    """
+    tickers = _ticker_list(tickers)
+    # max_concurrency None/0 means no limit: then every ticker may be in flight at once
+    concurrency = concurrency or YfConfig.network.max_concurrency or max(1, len(tickers))
+    needs_tz = _needs_tz(period, interval, start, end, repair)
+
+    # Cookie and crumb come from YfData (blocking, once), then ride along on the async session
+    data = YfData()
+    crumb, _ = await asyncio.to_thread(data._get_cookie_and_crumb, timeout)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncSession(impersonate="chrome", cookies=data._session.cookies,
+                            proxies=YfConfig.network.proxy, max_clients=concurrency) as session:
+        async def download_one(ticker):
+            try:
+                history = await _price_history(data, ticker, needs_tz, timeout)
+                # raise_errors: failures come back as this ticker's Exception, not a log line
+                request = history._history_request(period, interval, start, end, prepost, repair,
+                                                   raise_errors=True)
+                cacheable = request["end"] is not None and request["end"] + _DATA_DELAY <= _time.time()
+                async with semaphore:
+                    chart = await _fetch_chart(session, f"{_BASE_URL_}/v8/finance/chart/{ticker}",
+                                               request["params"], crumb, timeout, cacheable)
+                process = partial(history._process_history, chart, request, prepost, actions,
+                                  auto_adjust, back_adjust, repair, keepna, rounding, True)
+                return ticker, (await asyncio.to_thread(process) if repair else process())
+            except Exception as e:
+                return ticker, e
+
+        tasks = [asyncio.create_task(download_one(ticker)) for ticker in tickers]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Consumer stopped early: don't leave requests running on a closing session
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def download_async(tickers, start=None, end=None, actions=False, period=None,
+                         interval="1d", prepost=False, auto_adjust=True, back_adjust=False,
+                         repair=False, keepna=False, rounding=False, timeout=10, concurrency=None) -> dict:
+    """
+    Download yahoo tickers concurrently on one async HTTP client.
+    :Parameters:
+        As download(), without threads/progress/group_by, plus:
+        concurrency: int
+            Chart requests in flight. Default: yf.config.network.max_concurrency
+        Ranges resolve as in download(): no period, start or end means 1mo, and an `end`
+        on its own covers the month before it.
+    :Returns:
+        dict of ticker -> DataFrame, in the order given. Failed tickers get an empty
+        frame and are logged, as in download().
+    """
+    frames = {}
+    errors = {}
+    async for ticker, df in iter_download_async(
+            tickers, start=start, end=end, actions=actions, period=period, interval=interval,
+            prepost=prepost, auto_adjust=auto_adjust, back_adjust=back_adjust, repair=repair,
+            keepna=keepna, rounding=rounding, timeout=timeout, concurrency=concurrency):
+        if isinstance(df, Exception):
+            errors[ticker] = repr(df).replace(f'${ticker}: ', '')
+            df = utils.empty_df()
+        frames[ticker] = df
+
+    if errors:
+        # Log each distinct error once, with list of symbols affected
+        logger = utils.get_yf_logger()
+        logger.error('\n%.f Failed download%s:' % (len(errors), 's' if len(errors) > 1 else ''))
+        grouped = {}
+        for ticker, err in errors.items():
+            grouped.setdefault(err, []).append(ticker)
+        for err, failed in grouped.items():
+            logger.error(f'{failed}: ' + err)
+
+    return {ticker: frames[ticker] for ticker in _ticker_list(tickers)}
@@ -15,11 +15,14 @@ from yfinance.const import _BASE_URL_, _PRICE_COLNAMES_
 from yfinance.exceptions import YFDataException, YFInvalidPeriodError, YFPricesMissingError, YFRateLimitError, YFTzMissingError
 
 class PriceHistory:
-    def __init__(self, data, ticker, tz, session=None):
+    def __init__(self, data, ticker, tz, session=None, shared_errors=True):
         self._data = data
         self.ticker = ticker.upper()
         self.tz = tz
         self.session = session or requests.Session(impersonate="chrome")
+        # False: failures are only raised/returned, never written to shared._DFS/_ERRORS
+        # (callers that collect their own results, e.g. the async bulk download)
+        self._shared_errors = shared_errors
 
         self._history_cache = {}
         self._history_metadata = None
@@ -75,11 +78,24 @@ class PriceHistory:
             raise_errors : bool
                 If True, then raise errors as Exceptions instead of logging.
         """
-        logger = utils.get_yf_logger()
-
         if raise_errors:
             warnings.warn("'raise_errors' deprecated, do: yf.config.debug.hide_exceptions = False", DeprecationWarning, stacklevel=5)
 
+        request = self._history_request(period, interval, start, end, prepost, repair, raise_errors)
+        if request is None:
+            return utils.empty_df()
+        data = self._fetch_history(request, timeout, raise_errors)
+        return self._process_history(data, request, prepost, actions, auto_adjust, back_adjust,
+                                     repair, keepna, rounding, raise_errors)
+
+    def _history_request(self, period, interval, start, end, prepost, repair, raise_errors):
+        """
+        Works out the chart request for history() arguments: the Yahoo GET parameters plus
+        the resolved range that _process_history trims and labels with. None if the ticker
+        has no timezone (logged, or raised as history() would).
+        """
+        logger = utils.get_yf_logger()
+
         interval_user = interval
         period_user = period
         if repair and interval in ["5d", "1wk", "1mo", "3mo"]:
@@ -93,13 +109,14 @@ class PriceHistory:
                     # Every valid ticker has a timezone. A missing timezone is a problem.
                     _exception = YFTzMissingError(self.ticker)
                     err_msg = str(_exception)
-                    shared._DFS[self.ticker] = utils.empty_df()
-                    shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
+                    if self._shared_errors:
+                        shared._DFS[self.ticker] = utils.empty_df()
+                        shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
                     if raise_errors or (not YfConfig.debug.hide_exceptions):
                         raise _exception
                     else:
                         logger.error(err_msg)
-                    return utils.empty_df()
+                    return None
                 if period == 'ytd':
                     start = _datetime.date(pd.Timestamp.utcnow().tz_convert(tz).year, 1, 1)
                 else:
@@ -119,13 +136,14 @@ class PriceHistory:
                 # Every valid ticker has a timezone. A missing timezone is a problem.
                 _exception = YFTzMissingError(self.ticker)
                 err_msg = str(_exception)
-                shared._DFS[self.ticker] = utils.empty_df()
-                shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
+                if self._shared_errors:
+                    shared._DFS[self.ticker] = utils.empty_df()
+                    shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
                 if raise_errors or (not YfConfig.debug.hide_exceptions):
                     raise _exception
                 else:
                     logger.error(err_msg)
-                return utils.empty_df()
+                return None
 
         if start:
             start_dt = utils._parse_user_dt(start, tz)
@@ -192,12 +210,22 @@ class PriceHistory:
                 params_pretty[k] = str(pd.Timestamp(params[k], unit='s').tz_localize("UTC").tz_convert(tz))
         logger.debug(f'{self.ticker}: Yahoo GET parameters: {str(params_pretty)}')
 
+        if end is not None:
+            end_dt = pd.Timestamp(end, unit='s').tz_localize("UTC")
+        return {"params": params, "interval": interval, "interval_user": interval_user,
+                "period": period, "period_user": period_user, "start": start, "end": end,
+                "end_dt": end_dt if end is not None else None,
+                "start_user": start_user, "end_user": end_user}
+
+    def _fetch_history(self, request, timeout, raise_errors):
+        """GET the chart for a _history_request(), through the response cache when the range is final"""
+        params, end, end_dt = request["params"], request["end"], request["end_dt"]
+
         # Getting data from json
         url = f"{_BASE_URL_}/v8/finance/chart/{self.ticker}"
         data = None
         get_fn = self._data.get
         if end is not None:
-            end_dt = pd.Timestamp(end, unit='s').tz_localize("UTC")
             dt_now = pd.Timestamp.utcnow()
             data_delay = _datetime.timedelta(minutes=30)
             if end_dt + data_delay <= dt_now:
@@ -219,6 +247,18 @@ class PriceHistory:
         except Exception:
             if raise_errors or (not YfConfig.debug.hide_exceptions):
                 raise
+        return data
+
+    def _process_history(self, data, request, prepost, actions, auto_adjust, back_adjust,
+                         repair, keepna, rounding, raise_errors):
+        """Chart JSON for a _history_request() -> the history() frame, repaired and adjusted as asked"""
+        logger = utils.get_yf_logger()
+        params = request["params"]
+        interval, interval_user = request["interval"], request["interval_user"]
+        period, period_user = request["period"], request["period_user"]
+        start, end, end_dt = request["start"], request["end"], request["end_dt"]
+        start_user, end_user = request["start_user"], request["end_user"]
+        tz = self.tz
 
         # Store the meta data that gets retrieved simultaneously
         if data['chart']['result'] is None:
@@ -268,8 +308,9 @@ class PriceHistory:
 
         if fail:
             err_msg = str(_exception)
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
+            if self._shared_errors:
+                shared._DFS[self.ticker] = utils.empty_df()
+                shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
             if raise_errors or (not YfConfig.debug.hide_exceptions):
                 raise _exception
             else:
@@ -472,8 +513,9 @@ class PriceHistory:
                 err_msg = "auto_adjust failed with %s" % e
             else:
                 err_msg = "back_adjust failed with %s" % e
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg
+            if self._shared_errors:
+                shared._DFS[self.ticker] = utils.empty_df()
+                shared._ERRORS[self.ticker] = err_msg
             logger.error('%s: %s' % (self.ticker, err_msg))
 
         if rounding:
@@ -21,6 +21,23 @@ info_retired_keys = info_retired_keys_price | info_retired_keys_exchange | info_
 
 
 _QUOTE_SUMMARY_URL_ = f"{_BASE_URL_}/v10/finance/quoteSummary"
+_QUOTE_URL_ = f"{_QUERY1_URL_}/v7/finance/quote"
+
+# Symbols per v7 quote request in quote_snapshot(): 500 symbols = 5 requests
+_SNAPSHOT_BATCH_SIZE = 100
+# v7 quote field -> snapshot column, named as in FastInfo
+_SNAPSHOT_FIELDS = {
+    "regularMarketPrice": "lastPrice",
+    "regularMarketPreviousClose": "previousClose",
+    "regularMarketChangePercent": "changePercent",
+    "regularMarketOpen": "open",
+    "regularMarketDayHigh": "dayHigh",
+    "regularMarketDayLow": "dayLow",
+    "regularMarketVolume": "lastVolume",
+    "regularMarketTime": "marketTime",
+    "currency": "currency",
+    "marketState": "marketState",
+}
 
 
 class FastInfo:
@@ -777,3 +794,35 @@ class Quote:
         # filings = filings.set_index('date')
 
         return filings
+
+
+def quote_snapshot(symbols, batch_size=_SNAPSHOT_BATCH_SIZE, timeout=30) -> pd.DataFrame:
+    """
+    Latest price, previous close, day range, volume and market time for many symbols,
+    `batch_size` symbols per v7 quote request, as one frame indexed by symbol in the order
+    given. Symbols Yahoo doesn't return come back as all-NaN rows.
+    """
+    symbols = symbols if isinstance(symbols, (list, set, tuple)) else symbols.replace(',', ' ').split()
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    data = YfData()
+
+    records = []
+    for i in range(0, len(symbols), batch_size):
+        params_dict = {"symbols": ",".join(symbols[i:i + batch_size]), "fields": ",".join(_SNAPSHOT_FIELDS), "formatted": "false"}
+        try:
+            result = data.get_raw_json(_QUOTE_URL_, params=params_dict, timeout=timeout)
+        except curl_cffi.requests.exceptions.HTTPError as e:
+            if not YfConfig.debug.hide_exceptions:
+                raise
+            utils.get_yf_logger().error(str(e) + e.response.text)
+            continue
+        records.extend(result.get("quoteResponse", {}).get("result") or [])
+
+    df = pd.DataFrame.from_records(records, columns=["symbol"] + list(_SNAPSHOT_FIELDS))
+    df = df.drop_duplicates("symbol").set_index("symbol").reindex(symbols)
+    df = df.rename(columns=_SNAPSHOT_FIELDS)
+    numeric = ["lastPrice", "previousClose", "changePercent", "open", "dayHigh", "dayLow", "lastVolume"]
+    df[numeric] = df[numeric].astype(_np.float64)
+    df["marketTime"] = pd.to_datetime(df["marketTime"], unit="s", utc=True)
+    df.index.name = "Symbol"
+    return df
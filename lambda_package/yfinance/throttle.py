@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Process-wide request throttle for YfData: a token bucket caps the request rate, and an
+AIMD concurrency limit (additive increase, multiplicative decrease) backs off when Yahoo
+answers 429 and creeps back up while requests succeed. Shared by every thread.
+
+Configure with yf.config.network.rate_limit (requests/second, None or 0 to disable),
+.burst and .max_concurrency (requests in flight, None or 0 for no limit). Read counters
+with get_request_stats().
+"""
+
+import asyncio
+import threading
+import time as _time
+from collections import deque
+
+from .config import YfConfig
+from .utils import get_yf_logger
+
+# Concurrency limit: start, floor, and multiplicative decrease on 429
+_INITIAL_CONCURRENCY = 4
+_MIN_CONCURRENCY = 1
+_DECREASE_FACTOR = 0.5
+# One decrease per window: the requests already in flight when a 429 lands will likely get one too
+_DECREASE_COOLDOWN = 1.0
+
+# Bucket pause after a 429 without a usable Retry-After header, and the cap on Retry-After
+_THROTTLE_PAUSE = 2.0
+_MAX_PAUSE = 60.0
+
+# Window for the request-rate metric
+_RATE_WINDOW = 60.0
+
+
+class TokenBucket:
+    """`rate` tokens per second, up to `burst` banked. A pause puts the bucket into debt."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = _time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, rate, burst):
+        with self._lock:
+            self.rate, self.burst = rate, burst
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self):
+        """0 once a token is taken, else seconds until one is due"""
+        with self._lock:
+            if not self.rate:
+                return 0
+            self._refill(_time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while wait := self._take():
+            _time.sleep(wait)
+
+    async def acquire_async(self):
+        while wait := self._take():
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            if not self.rate:
+                return
+            self._refill(_time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on requests in flight: +1 per window of successes, halved on a 429.
+    Requests that raised (timeouts, resets) don't count as successes. `maximum` None: no limit.
+    """
+
+    def __init__(self, initial, minimum, maximum):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.maximum and self.in_flight >= max(self.minimum, int(self.limit)):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False, failed=False):
+        with self._cond:
+            self.in_flight -= 1
+            now = _time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= _DECREASE_COOLDOWN:
+                    self.limit = max(self.minimum, self.limit * _DECREASE_FACTOR)
+                    self._last_decrease = now
+            elif not failed and self.maximum:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class RequestThrottle:
+    def __init__(self):
+        network = YfConfig.network
+        self._bucket = TokenBucket(network.rate_limit, network.burst)
+        maximum = network.max_concurrency or None
+        self._concurrency = AdaptiveConcurrency(
+            min(_INITIAL_CONCURRENCY, maximum or _INITIAL_CONCURRENCY), _MIN_CONCURRENCY, maximum)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._throttled = 0
+        self._queue_delay_total = 0.0
+        self._queue_delay_max = 0.0
+        self._recent = deque()
+
+    def _sync_config(self):
+        network = YfConfig.network
+        self._bucket.configure(network.rate_limit, network.burst)
+        self._concurrency.maximum = network.max_concurrency or None
+
+    def _record_wait(self, started):
+        waited = _time.monotonic() - started
+        with self._lock:
+            self._queue_delay_total += waited
+            self._queue_delay_max = max(self._queue_delay_max, waited)
+
+    def acquire(self):
+        """Blocks until both a concurrency slot and a token are available"""
+        self._sync_config()
+        started = _time.monotonic()
+        self._concurrency.acquire()
+        try:
+            self._bucket.acquire()
+        except BaseException:
+            self._concurrency.release()
+            raise
+        self._record_wait(started)
+
+    def release(self, response=None, failed=False):
+        """`failed`: the request raised (timeout, reset), so it must not grow the concurrency limit"""
+        self._concurrency.release(self._record_response(response), failed=failed)
+
+    async def acquire_async(self):
+        """
+        Waits for a token without blocking the event loop. Async callers bound their own
+        concurrency (one pooled client), so only the rate and 429 pauses are shared.
+        """
+        self._sync_config()
+        started = _time.monotonic()
+        await self._bucket.acquire_async()
+        self._record_wait(started)
+
+    def release_async(self, response=None):
+        self._record_response(response)
+
+    def _record_response(self, response):
+        throttled = response is not None and response.status_code == 429
+        if throttled:
+            pause = _THROTTLE_PAUSE
+            try:
+                pause = min(_MAX_PAUSE, float(response.headers.get('Retry-After')))
+            except (TypeError, ValueError):
+                pass
+            self._bucket.pause(pause)
+            get_yf_logger().debug(f'rate limited: pausing {pause}s, concurrency limit {self._concurrency.limit:.1f}')
+
+        now = _time.monotonic()
+        with self._lock:
+            self._requests += 1
+            self._throttled += throttled
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - _RATE_WINDOW:
+                self._recent.popleft()
+        return throttled
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'throttled': self._throttled,
+                'request_rate': len(self._recent) / _RATE_WINDOW,
+                'queue_delay_avg': self._queue_delay_total / self._requests if self._requests else 0.0,
+                'queue_delay_max': self._queue_delay_max,
+                'in_flight': self._concurrency.in_flight,
+                'concurrency_limit': self._concurrency.limit,
+                'rate_limit': self._bucket.rate,
+            }
+
+
+_throttle = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle():
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                _throttle = RequestThrottle()
+    return _throttle
+
+
+def get_request_stats():
+    """
+    Counters since process start: requests, throttled (429s), request_rate (per second, last 60s),
+    queue_delay_avg/max (seconds waiting for a slot), in_flight, concurrency_limit, rate_limit.
+    """
+    return get_throttle().stats()
@@ -507,32 +507,59 @@ def back_adjust(data):
     return df[[c for c in col_order if c in df.columns]]
 
 
+def _float_column(values):
+    # None (Yahoo's gaps) -> NaN
+    return _np.array(values, dtype=_np.float64)
+
+
+def _utc_index(timestamps):
+    return _pd.to_datetime(_np.asarray(timestamps, dtype=_np.int64), unit="s")
+
+
 def parse_quotes(data):
-    timestamps = data["timestamp"]
     ohlc = data["indicators"]["quote"][0]
-    volumes = ohlc["volume"]
-    opens = ohlc["open"]
-    closes = ohlc["close"]
-    lows = ohlc["low"]
-    highs = ohlc["high"]
+    index = _utc_index(data["timestamp"])
 
+    closes = _float_column(ohlc["close"])
     adjclose = closes
     if "adjclose" in data["indicators"]:
-        adjclose = data["indicators"]["adjclose"][0]["adjclose"]
+        adjclose = _float_column(data["indicators"]["adjclose"][0]["adjclose"])
+
+    volumes = _float_column(ohlc["volume"])
+    # Integer dtype only when nothing is lost: crypto and FX volumes can be fractional
+    if not _np.isnan(volumes).any() and (volumes == _np.floor(volumes)).all():
+        volumes = volumes.astype(_np.int64)
 
-    quotes = _pd.DataFrame({"Open": opens,
-                            "High": highs,
-                            "Low": lows,
+    quotes = _pd.DataFrame({"Open": _float_column(ohlc["open"]),
+                            "High": _float_column(ohlc["high"]),
+                            "Low": _float_column(ohlc["low"]),
                             "Close": closes,
                             "Adj Close": adjclose,
-                            "Volume": volumes})
+                            "Volume": volumes}, index=index, copy=False)
 
-    quotes.index = _pd.to_datetime(timestamps, unit="s")
-    quotes.sort_index(inplace=True)
+    # Yahoo's timestamps are almost always already ascending
+    if not quotes.index.is_monotonic_increasing:
+        quotes.sort_index(inplace=True)
 
     return quotes
 
 
+def _parse_events(events, columns):
+    """{key: {"date": .., field: ..}} -> frame with `columns` {name: field}, indexed by date"""
+    events = list(events.values())
+    df = _pd.DataFrame({name: [e.get(field) for e in events] for name, field in columns.items()},
+                       index=_utc_index([e["date"] for e in events]))
+    df.index.name = "date"
+    if not df.index.is_monotonic_increasing:
+        df.sort_index(inplace=True)
+    return df
+
+
+def _empty_events(column):
+    # Same frame as DataFrame(columns=[column], index=DatetimeIndex([])), built without column inference
+    return _pd.DataFrame({column: _np.empty(0, dtype=object)}, index=_pd.DatetimeIndex([]))
+
+
 def parse_actions(data):
     dividends = None
     capital_gains = None
@@ -540,42 +567,27 @@ def parse_actions(data):
 
     if "events" in data:
         if "dividends" in data["events"] and len(data["events"]['dividends']) > 0:
-            dividends = _pd.DataFrame(
-                data=list(data["events"]["dividends"].values()))
-            dividends.set_index("date", inplace=True)
-            dividends.index = _pd.to_datetime(dividends.index, unit="s")
-            dividends.sort_index(inplace=True)
-            if 'currency' in dividends.columns and (dividends['currency'] == '').all():
+            dividends = _parse_events(data["events"]["dividends"], {"Dividends": "amount", "currency": "currency"})
+            dividends["Dividends"] = dividends["Dividends"].astype(_np.float64)
+            if dividends['currency'].isna().all() or (dividends['currency'] == '').all():
                 # Currency column useless, drop it.
                 dividends = dividends.drop('currency', axis=1)
-            dividends = dividends.rename(columns={'amount': 'Dividends'})
 
         if "capitalGains" in data["events"] and len(data["events"]['capitalGains']) > 0:
-            capital_gains = _pd.DataFrame(
-                data=list(data["events"]["capitalGains"].values()))
-            capital_gains.set_index("date", inplace=True)
-            capital_gains.index = _pd.to_datetime(capital_gains.index, unit="s")
-            capital_gains.sort_index(inplace=True)
-            capital_gains.columns = ["Capital Gains"]
+            capital_gains = _parse_events(data["events"]["capitalGains"], {"Capital Gains": "amount"})
+            capital_gains["Capital Gains"] = capital_gains["Capital Gains"].astype(_np.float64)
 
         if "splits" in data["events"] and len(data["events"]['splits']) > 0:
-            splits = _pd.DataFrame(
-                data=list(data["events"]["splits"].values()))
-            splits.set_index("date", inplace=True)
-            splits.index = _pd.to_datetime(splits.index, unit="s")
-            splits.sort_index(inplace=True)
-            splits["Stock Splits"] = splits["numerator"] / splits["denominator"]
+            splits = _parse_events(data["events"]["splits"], {"numerator": "numerator", "denominator": "denominator"})
+            splits["Stock Splits"] = splits["numerator"].to_numpy(_np.float64) / splits["denominator"].to_numpy(_np.float64)
             splits = splits[["Stock Splits"]]
 
     if dividends is None:
-        dividends = _pd.DataFrame(
-            columns=["Dividends"], index=_pd.DatetimeIndex([]))
+        dividends = _empty_events("Dividends")
     if capital_gains is None:
-        capital_gains = _pd.DataFrame(
-            columns=["Capital Gains"], index=_pd.DatetimeIndex([]))
+        capital_gains = _empty_events("Capital Gains")
     if splits is None:
-        splits = _pd.DataFrame(
-            columns=["Stock Splits"], index=_pd.DatetimeIndex([]))
+        splits = _empty_events("Stock Splits")
 
     return dividends, splits, capital_gains
 
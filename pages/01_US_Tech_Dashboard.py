@@ -1,116 +1,144 @@
 import streamlit as st
 import pandas as pd
-import psycopg2
-import boto3
-import json
 import plotly.express as px
-import os
-from dotenv import load_dotenv
+import plotly.graph_objects as go
+from dashboard_data import (
+    DEFAULT_SYMBOLS, LIVE_POLL_SECONDS, RANGE_OPTIONS, RECORDS_PAGE_SIZE, clear_cache,
+    get_live_frame, live_revision, load_candles, load_latest_closes, load_records_page, load_symbols
+)
+from downsample import downsample_lines
 
 # Page Config
 st.set_page_config(page_title="US Tech Stocks", page_icon="📈", layout="wide")
 
-# Load environment variables
-load_dotenv()
-
-# --- SECURITY: Fetch Credentials ---
-def get_db_connection():
-    """
-    Tries to get creds from AWS Secrets Manager first.
-    Falls back to local .env file if AWS fails.
-    """
-    db_host, db_name, db_user, db_pass = None, None, None, None
-    
-    # 1. Try AWS Secrets Manager
-    try:
-        session = boto3.session.Session()
-        client = session.client(service_name='secretsmanager', region_name='us-east-1')
-        secret_value = client.get_secret_value(SecretId='tadawul-secrets')
-        secret = json.loads(secret_value['SecretString'])
-        
-        db_host = secret['DB_HOST']
-        db_name = secret['DB_NAME']
-        db_user = secret['DB_USER']
-        db_pass = secret['DB_PASS']
-        
-    except Exception:
-        # 2. Fallback to .env (for local testing)
-        db_host = os.environ.get("DB_HOST")
-        db_name = os.environ.get("DB_NAME")
-        db_user = os.environ.get("DB_USER")
-        db_pass = os.environ.get("DB_PASS")
-
-    if not db_pass:
-        st.error("❌ Critical Error: No credentials found in AWS Secrets or .env")
-        st.stop()
-
-    return psycopg2.connect(
-        host=db_host,
-        database=db_name,
-        user=db_user,
-        password=db_pass
-    )
-
-# --- DATA: Query the DB ---
-def load_data():
-    conn = get_db_connection()
-    query = "SELECT * FROM daily_prices ORDER BY date ASC"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
-
 # --- UI: The Dashboard Layout ---
 st.title("📈 US Tech Stock Tracker")
 st.markdown("Automated ETL Pipeline: **AWS Lambda** → **RDS PostgreSQL**")
 
 # Refresh Button
 if st.button("🔄 Refresh Data"):
+    clear_cache()
     st.rerun()
 
-# Load Data
-try:
-    df = load_data()
+# --- LIVE VIEW: metrics re-run on their own every few seconds ---
+@st.fragment(run_every=LIVE_POLL_SECONDS)
+def live_view(symbols, range_label):
+    redraw = False
+    try:
+        # Kept current in place from the processor's NOTIFYs; only new rows are fetched
+        get_live_frame(symbols, range_label)
+        # The chart sits outside the fragment: rebuilt only when new rows actually arrived
+        redraw = live_revision() != st.session_state.get("chart_revision")
+        latest = load_latest_closes(symbols)
     
-    # Quick Stats Row
-    latest_date = df['date'].max()
-    st.info(f"📅 Latest Data Point: **{latest_date}**")
+        # Quick Stats Row
+        latest_date = latest['date'].max()
+        st.info(f"📅 Latest Data Point: **{latest_date}**")
 
-    col1, col2, col3 = st.columns(3)
-    
-    # Metrics
-    for i, symbol in enumerate(["TSLA", "NVDA", "AAPL"]):
-        stock_data = df[df['symbol'] == symbol]
-        if not stock_data.empty:
-            latest_close = stock_data.iloc[-1]['close']
-            prev_close = stock_data.iloc[-2]['close'] if len(stock_data) > 1 else latest_close
-            change = latest_close - prev_close
-            pct_change = (change / prev_close) * 100
-            
-            with [col1, col2, col3][i]:
+        # Metrics (wrap every 6 symbols)
+        columns_per_row = 6
+        for i, row in enumerate(latest.itertuples(index=False)):
+            if i % columns_per_row == 0:
+                cols = st.columns(columns_per_row)
+            pct_change = row.pct_change if pd.notna(row.pct_change) else 0.0
+            high_52w = getattr(row, 'high_52w', None)
+            low_52w = getattr(row, 'low_52w', None)
+            help_text = f"52-week range: ${low_52w:.2f} – ${high_52w:.2f}" if pd.notna(high_52w) and pd.notna(low_52w) else None
+
+            with cols[i % columns_per_row]:
                 st.metric(
-                    label=symbol, 
-                    value=f"${latest_close:.2f}", 
-                    delta=f"{pct_change:.2f}%"
+                    label=row.symbol, 
+                    value=f"${row.close:.2f}", 
+                    delta=f"{pct_change:.2f}%",
+                    help=help_text
                 )
 
+    except Exception as e:
+        st.error(f"Failed to load data: {e}")
+
+    if redraw:
+        st.rerun()
+
+def price_chart(df, symbols, range_label):
     # 📊 MAIN CHART
     st.subheader("Price History")
-    
-    # Create interactive Plotly chart
-    fig = px.line(
-        df, 
-        x='date', 
-        y='close', 
-        color='symbol', 
-        markers=True,
-        title='Closing Price Trends',
-        labels={'close': 'Price (USD)', 'date': 'Date'}
-    )
+    chart_type = st.radio("Chart", ["Line", "Candlestick"], horizontal=True)
+    # Downsampled by default so the payload stays bounded; full resolution on demand
+    full_resolution = st.toggle("Full resolution", value=False)
+
+    if chart_type == "Line":
+        chart_df = df if full_resolution else downsample_lines(df)
+
+        # Create interactive Plotly chart
+        fig = px.line(
+            chart_df, 
+            x='date', 
+            y='close', 
+            color='symbol', 
+            title='Closing Price Trends',
+            labels={'close': 'Price (USD)', 'date': 'Date'}
+        )
+    else:
+        # Weekly and larger candles come pre-aggregated from the processor's rollups
+        chart_df, candle_size = (df, "Daily") if full_resolution else load_candles(df, symbols, range_label)
+
+        fig = go.Figure([
+            go.Candlestick(
+                x=bars['date'], open=bars['open'], high=bars['high'],
+                low=bars['low'], close=bars['close'], name=symbol
+            )
+            for symbol, bars in chart_df.groupby('symbol')
+        ])
+        fig.update_layout(
+            title=f'{candle_size} Candles',
+            xaxis_title='Date',
+            yaxis_title='Price (USD)',
+            xaxis_rangeslider_visible=False
+        )
     st.plotly_chart(fig, use_container_width=True)
 
-    # Raw Data Table (Collapsible)
+# Load Data
+try:
+    # Selectors drive the queries: only the chosen symbols and range leave the DB
+    all_symbols = load_symbols()
+    symbols = st.multiselect(
+        "Symbols",
+        all_symbols,
+        default=[symbol for symbol in DEFAULT_SYMBOLS if symbol in all_symbols]
+    )
+    range_label = st.radio("Range", list(RANGE_OPTIONS), index=2, horizontal=True)
+
+    if not symbols:
+        st.warning("Pick at least one symbol.")
+        st.stop()
+
+    df = get_live_frame(symbols, range_label)
+    st.session_state["chart_revision"] = live_revision()
+    live_view(symbols, range_label)
+    price_chart(df, symbols, range_label)
+
+    # Raw Data Table (Collapsible, paginated, only queried once switched on)
     with st.expander("📂 View Raw Database Records"):
-        st.dataframe(df.sort_values(by=['date'], ascending=False))
+        if st.toggle("Load records", value=False):
+            # Cursor stack: the keyset position each visited page started from
+            state_key = f"records_cursors_{'_'.join(symbols)}"
+            cursors = st.session_state.setdefault(state_key, [None])
+
+            page = load_records_page(symbols, after=cursors[-1])
+            st.dataframe(page, use_container_width=True, hide_index=True)
+
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                if st.button("⬅️ Newer", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+            with page_col:
+                st.caption(f"Page {len(cursors)}")
+            with next_col:
+                if st.button("Older ➡️", disabled=len(page) < RECORDS_PAGE_SIZE):
+                    last = page.iloc[-1]
+                    cursors.append((last['date'], last['symbol']))
+                    st.rerun()
 
 except Exception as e:
     st.error(f"Failed to load data: {e}")
\ No newline at end of file
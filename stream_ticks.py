@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import os
+import time
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+from yfinance.live import AsyncWebSocket
+from etl_lambda.loader import STREAM_BAR_COLUMNS, TICK_COLUMNS, copy_ticks, upsert_bars
+from tick_aggregator import TickAggregator
+
+# Load local .env credentials
+load_dotenv()
+
+# --- CONFIGURATION ---
+DB_HOST = os.environ.get("DB_HOST")
+DB_NAME = os.environ.get("DB_NAME")
+DB_USER = os.environ.get("DB_USER")
+DB_PASS = os.environ.get("DB_PASS")
+
+SYMBOLS = ["TSLA", "NVDA", "AAPL"]
+
+# A micro-batch is flushed when it reaches this many ticks...
+FLUSH_MAX_TICKS = int(os.environ.get("STREAM_FLUSH_TICKS", "500"))
+# ...or when this much time has passed since the last flush, whichever comes first
+FLUSH_INTERVAL_SECONDS = float(os.environ.get("STREAM_FLUSH_SECONDS", "2"))
+
+# While the DB is unreachable, ticks pile up; past this the oldest are dropped
+MAX_BUFFERED_TICKS = 50_000
+
+class TickStreamer:
+    """
+    Buffers decoded ticks and feeds them to a TickAggregator (1m/5m/15m bars + VWAP).
+    Every flush COPYs the buffered ticks and upserts the bars that closed or changed, in one transaction.
+    """
+    def __init__(self, flush_max_ticks=FLUSH_MAX_TICKS, flush_interval=FLUSH_INTERVAL_SECONDS):
+        self.flush_max_ticks = flush_max_ticks
+        self.flush_interval = flush_interval
+        self.ticks = []
+        self.aggregator = TickAggregator()
+        self.pending_bars = None    # bars from a failed flush, retried with the next one
+        self.day_volume = {}        # symbol -> last cumulative day volume, to turn it into per-tick volume
+        self.conn = None
+        self.full = asyncio.Event()
+        self.stopping = False
+        self.flushed_ticks = 0
+
+    def on_message(self, message):
+        """AsyncWebSocket handler: runs on the event loop, so it only touches memory"""
+        if "error" in message or not message.get("id") or "price" not in message or "time" not in message:
+            return
+        symbol = message["id"]
+        price = float(message["price"])
+        ts = int(message["time"])
+        day_volume = int(message.get("day_volume", 0))
+        self.ticks.append((symbol, ts, price, day_volume, int(message.get("last_size", 0))))
+        self.aggregator.add(symbol, ts, price, self.tick_volume(symbol, day_volume))
+
+        if len(self.ticks) >= self.flush_max_ticks:
+            self.full.set()
+
+    def tick_volume(self, symbol, day_volume):
+        """Turns Yahoo's cumulative day volume into the volume traded since the previous tick"""
+        previous = self.day_volume.get(symbol)
+        self.day_volume[symbol] = day_volume
+        # Day volume restarts at the open; the first tick we see has no baseline
+        if previous is None:
+            return 0
+        if day_volume < previous:
+            return day_volume
+        return day_volume - previous
+
+    def take_batch(self):
+        """Swaps out the buffered ticks, and collects closed bars plus open bars that changed"""
+        ticks, self.ticks = self.ticks, []
+        self.full.clear()
+
+        self.aggregator.fold()
+        self.aggregator.close_expired()
+        bars = pd.concat([self.aggregator.drain(), self.aggregator.open_bars()], ignore_index=True)
+        if self.pending_bars is not None:
+            # Newer state of the same bar wins
+            bars = pd.concat([self.pending_bars, bars], ignore_index=True)
+            bars = bars.drop_duplicates(["symbol", "interval", "ts"], keep="last")
+            self.pending_bars = None
+        return ticks, bars
+
+    def get_connection(self):
+        if self.conn is None or self.conn.closed:
+            self.conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS, connect_timeout=5)
+        return self.conn
+
+    def write_batch(self, ticks, bars):
+        """Blocking DB write; runs in a worker thread so the socket keeps being read"""
+        tick_rows = pd.DataFrame(ticks, columns=TICK_COLUMNS)
+        tick_rows["ts"] = pd.to_datetime(tick_rows["ts"], unit="ms", utc=True).dt.strftime("%Y-%m-%d %H:%M:%S.%f+00:00")
+        bar_rows = bars[STREAM_BAR_COLUMNS].copy()
+        bar_rows["ts"] = bar_rows["ts"].dt.strftime("%Y-%m-%d %H:%M:%S+00:00")
+
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                copy_ticks(cursor, tick_rows)
+                upsert_bars(cursor, bar_rows)
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+
+    async def flush(self):
+        ticks, bars = self.take_batch()
+        if not ticks and bars.empty:
+            return
+        try:
+            started = time.perf_counter()
+            await asyncio.to_thread(self.write_batch, ticks, bars)
+            self.flushed_ticks += len(ticks)
+            print(f"   💾 {len(ticks)} ticks, {len(bars)} bars in {(time.perf_counter() - started) * 1000:.0f} ms")
+        except Exception as e:
+            # Put the batch back in front of anything that arrived meanwhile and retry next flush
+            print(f"   ❌ Flush failed, will retry: {e}")
+            self.ticks = (ticks + self.ticks)[-MAX_BUFFERED_TICKS:]
+            self.pending_bars = bars
+
+    async def flush_loop(self):
+        """One flush at a time: on the timer, or early when the buffer fills up. Drains on stop()."""
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+        await self.flush()
+
+    def stop(self):
+        self.stopping = True
+        self.full.set()
+
+    def close(self):
+        if self.conn is not None and not self.conn.closed:
+            self.conn.close()
+
+async def run_stream(symbols, flush_max_ticks, flush_interval):
+    streamer = TickStreamer(flush_max_ticks, flush_interval)
+    flusher = asyncio.create_task(streamer.flush_loop())
+    try:
+        async with AsyncWebSocket(verbose=False) as ws:
+            await ws.subscribe(symbols)
+            print(f"📡 Streaming {', '.join(symbols)} (flush every {flush_max_ticks} ticks or {flush_interval}s)")
+            await ws.listen(streamer.on_message)
+    finally:
+        # Not cancelled: an in-flight write finishes, then whatever is still buffered goes out
+        streamer.stop()
+        await flusher
+        streamer.close()
+        print(f"\n🛑 Stream stopped after {streamer.flushed_ticks} ticks")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream live ticks into the ticks table and rolling 1m/5m/15m bars")
+    parser.add_argument("--symbols", nargs="+", default=SYMBOLS)
+    parser.add_argument("--flush-ticks", type=int, default=FLUSH_MAX_TICKS)
+    parser.add_argument("--flush-seconds", type=float, default=FLUSH_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_stream(args.symbols, args.flush_ticks, args.flush_seconds))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+
+# In-memory tick -> OHLCV/VWAP bar engine for the streaming ingester.
+# Ticks land in preallocated NumPy buffers (one scalar write per field, no pandas per
+# message); every fold sorts the buffered ticks once and reduces them into bars for
+# all intervals with reduceat. Memory is fixed: the tick buffer plus one open bar per
+# (symbol, interval).
+
+# Bar sizes built from the stream, in minutes
+INTERVALS = {"1m": 1, "5m": 5, "15m": 15}
+
+# Ticks buffered before a fold is forced; a fold also runs on every flush
+TICK_CAPACITY = 65_536
+
+# A bar closes on time this long after its end, unless a newer tick closed it already
+CLOSE_GRACE_MS = 2_000
+
+MINUTE_MS = 60_000
+
+BAR_FIELDS = ["open", "high", "low", "close", "volume", "pv"]
+
+class TickAggregator:
+    """
+    Builds bars for every interval in `intervals` from (symbol, ts ms, price, volume) ticks.
+
+    add() is the per-message path. fold() reduces the buffer into the open bars, close_expired()
+    closes bars whose time is up, drain() hands back the closed bars and open_bars() the ones still
+    building. Out-of-order ticks for a bucket that never closed still make a bar; ticks for a bar
+    that already closed are dropped and counted in `late_ticks`.
+    """
+    def __init__(self, intervals=INTERVALS, capacity=TICK_CAPACITY, grace_ms=CLOSE_GRACE_MS):
+        self.intervals = dict(intervals)
+        self.capacity = capacity
+        self.grace_ms = grace_ms
+
+        # Late ticks are counted against the finest interval only
+        self.finest = min(self.intervals, key=self.intervals.get)
+
+        self.symbols = []
+        self.codes = {}
+        self.late_ticks = 0
+        # Per symbol: timestamp of its newest tick, the clock close_expired() goes by
+        self.latest_ts = np.full(0, -1, dtype=np.int64)
+
+        # Tick buffer
+        self.count = 0
+        self.tick_symbol = np.empty(capacity, dtype=np.int32)
+        self.tick_ts = np.empty(capacity, dtype=np.int64)
+        self.tick_price = np.empty(capacity, dtype=np.float64)
+        self.tick_volume = np.empty(capacity, dtype=np.float64)
+
+        # Per interval, indexed by symbol code: the open bar, and the last bucket that closed
+        self.state = {label: self._empty_state(0) for label in self.intervals}
+        self.closed = {label: [] for label in self.intervals}
+
+    @staticmethod
+    def _empty_state(n):
+        return {
+            "bucket": np.full(n, -1, dtype=np.int64),
+            "closed_through": np.full(n, -1, dtype=np.int64),
+            "is_open": np.zeros(n, dtype=bool),
+            "dirty": np.zeros(n, dtype=bool),
+            "bars": np.zeros((n, len(BAR_FIELDS)), dtype=np.float64),
+        }
+
+    def _register(self, symbol):
+        code = len(self.symbols)
+        self.symbols.append(symbol)
+        self.codes[symbol] = code
+        # Symbols are few and arrive early; grow the per-symbol arrays by doubling
+        for label, state in self.state.items():
+            if code >= len(state["bucket"]):
+                grown = self._empty_state(max(8, 2 * len(state["bucket"])))
+                for key, array in state.items():
+                    grown[key][:len(array)] = array
+                self.state[label] = grown
+        if code >= len(self.latest_ts):
+            grown = np.full(max(8, 2 * len(self.latest_ts)), -1, dtype=np.int64)
+            grown[:len(self.latest_ts)] = self.latest_ts
+            self.latest_ts = grown
+        return code
+
+    def add(self, symbol, ts_ms, price, volume):
+        code = self.codes.get(symbol)
+        if code is None:
+            code = self._register(symbol)
+        i = self.count
+        self.tick_symbol[i] = code
+        self.tick_ts[i] = ts_ms
+        self.tick_price[i] = price
+        self.tick_volume[i] = volume
+        self.count = i + 1
+        if self.count == self.capacity:
+            self.fold()
+
+    def fold(self):
+        """Reduces the buffered ticks into open bars, closing any bar a newer tick has moved past"""
+        n = self.count
+        if n == 0:
+            return
+        self.count = 0
+        symbol = self.tick_symbol[:n]
+        ts = self.tick_ts[:n]
+        # One sort serves every interval: (symbol, ts) order is also (symbol, bucket) order
+        order = np.lexsort((ts, symbol))
+        symbol = symbol[order]
+        ts = ts[order]
+        minute = ts // MINUTE_MS
+        price = self.tick_price[:n][order]
+        volume = self.tick_volume[:n][order]
+
+        # Sorted by (symbol, ts): a symbol's last tick here is its newest
+        newest = np.r_[symbol[1:] != symbol[:-1], True]
+        codes = symbol[newest]
+        self.latest_ts[codes] = np.maximum(self.latest_ts[codes], ts[newest])
+
+        for label, minutes in self.intervals.items():
+            self._fold_interval(label, symbol, minute // minutes, price, volume)
+
+    def _fold_interval(self, label, symbol, bucket, price, volume):
+        state = self.state[label]
+
+        keep = bucket > state["closed_through"][symbol]
+        if not keep.all():
+            if label == self.finest:
+                self.late_ticks += int((~keep).sum())
+            symbol, bucket, price, volume = symbol[keep], bucket[keep], price[keep], volume[keep]
+            if len(symbol) == 0:
+                return
+
+        # Group boundaries: wherever symbol or bucket changes
+        change = np.empty(len(symbol), dtype=bool)
+        change[0] = True
+        np.not_equal(symbol[1:], symbol[:-1], out=change[1:])
+        change[1:] |= bucket[1:] != bucket[:-1]
+        starts = np.flatnonzero(change)
+        ends = np.r_[starts[1:], len(symbol)] - 1
+
+        group_symbol = symbol[starts]
+        group_bucket = bucket[starts]
+        bars = np.column_stack([
+            price[starts],
+            np.maximum.reduceat(price, starts),
+            np.minimum.reduceat(price, starts),
+            price[ends],
+            np.add.reduceat(volume, starts),
+            np.add.reduceat(price * volume, starts),
+        ])
+
+        # Compare every group with its symbol's open bar, as it stood before this fold
+        is_last = np.r_[group_symbol[1:] != group_symbol[:-1], True]
+        open_bucket = state["bucket"][group_symbol]
+        is_open = state["is_open"][group_symbol]
+
+        # A group that continues the open bar merges into it
+        merge = is_open & (group_bucket == open_bucket)
+        if merge.any():
+            previous = state["bars"][group_symbol[merge]]
+            merged = bars[merge]
+            merged[:, 0] = previous[:, 0]
+            merged[:, 1] = np.maximum(merged[:, 1], previous[:, 1])
+            merged[:, 2] = np.minimum(merged[:, 2], previous[:, 2])
+            merged[:, 4:] += previous[:, 4:]
+            bars[merge] = merged
+
+        # Late ticks: newer than anything closed, older than the open bar. Nothing was emitted
+        # for that bucket yet, so they close as a bar of their own and the open bar is kept.
+        late = is_open & (group_bucket < open_bucket)
+
+        # Open bars that a newer bucket has moved past are complete (groups are sorted, so a
+        # symbol's last group holds its newest bucket). When a group merged into the open bar,
+        # that group carries it and is emitted below instead.
+        moved_past = is_last & is_open & (group_bucket > open_bucket) & ~np.isin(group_symbol, group_symbol[merge])
+        if moved_past.any():
+            codes = group_symbol[moved_past]
+            self._emit(label, codes, state["bucket"][codes], state["bars"][codes])
+            np.maximum.at(state["closed_through"], codes, open_bucket[moved_past])
+
+        # Within a symbol, every group but the last is complete too, and so are late groups
+        complete = ~is_last | late
+        if complete.any():
+            self._emit(label, group_symbol[complete], group_bucket[complete], bars[complete])
+            np.maximum.at(state["closed_through"], group_symbol[complete], group_bucket[complete])
+
+        # The newest group becomes the open bar, unless it is older than the open bar
+        opens = is_last & ~late
+        codes = group_symbol[opens]
+        state["bucket"][codes] = group_bucket[opens]
+        state["bars"][codes] = bars[opens]
+        state["is_open"][codes] = True
+        state["dirty"][codes] = True
+
+    def close_expired(self, now_ms=None):
+        """
+        Closes open bars whose end (plus grace) has passed.
+
+        By default the clock is each symbol's own newest tick, so a delayed feed never closes a
+        bar under ticks still in flight; a symbol that goes quiet keeps its last bar open (still
+        handed out by open_bars()) until its next tick moves past it. Pass `now_ms` to close by
+        wall clock instead: quiet symbols then close too, but any tick arriving more than
+        `grace_ms` after its bar's end is dropped and counted in `late_ticks`.
+        """
+        n = len(self.symbols)
+        clock = self.latest_ts[:n] if now_ms is None else now_ms
+        for label, minutes in self.intervals.items():
+            state = self.state[label]
+            width = minutes * MINUTE_MS
+            expired = state["is_open"][:n] & ((state["bucket"][:n] + 1) * width + self.grace_ms <= clock)
+            if expired.any():
+                codes = np.flatnonzero(expired)
+                self._emit(label, codes, state["bucket"][codes], state["bars"][codes])
+                state["closed_through"][codes] = state["bucket"][codes]
+                state["is_open"][codes] = False
+                state["dirty"][codes] = False
+
+    def _emit(self, label, codes, buckets, bars):
+        self.closed[label].append((codes.copy(), buckets.copy(), bars.copy()))
+
+    def _frame(self, parts):
+        """(label, codes, buckets, bars) parts -> rows in the shape of intraday_prices + vwap, one DataFrame build"""
+        labels = list(self.intervals)
+        codes = np.concatenate([part[1] for part in parts] or [np.empty(0, dtype=np.int64)])
+        interval = np.concatenate([np.full(len(part[1]), labels.index(part[0])) for part in parts] or [np.empty(0, dtype=np.int64)])
+        start_ms = np.concatenate([part[2] * self.intervals[part[0]] * MINUTE_MS for part in parts] or [np.empty(0, dtype=np.int64)])
+        bars = np.concatenate([part[3] for part in parts] or [np.empty((0, len(BAR_FIELDS)))])
+        volume = bars[:, 4]
+        return pd.DataFrame({
+            "symbol": np.asarray(self.symbols, dtype=object)[codes],
+            "interval": np.asarray(labels, dtype=object)[interval],
+            "ts": pd.DatetimeIndex(start_ms.astype("datetime64[ms]")).tz_localize("UTC"),
+            "open": bars[:, 0],
+            "high": bars[:, 1],
+            "low": bars[:, 2],
+            "close": bars[:, 3],
+            "volume": volume.astype(np.int64),
+            # No traded volume (e.g. indices): fall back to the close
+            "vwap": np.where(volume > 0, bars[:, 5] / np.where(volume > 0, volume, 1), bars[:, 3]),
+        })
+
+    def drain(self):
+        """Closed bars since the last drain, every interval, as one frame"""
+        parts = []
+        for label, chunks in self.closed.items():
+            parts.extend((label, *chunk) for chunk in chunks)
+            chunks.clear()
+        return self._frame(parts)
+
+    def open_bars(self, dirty_only=True):
+        """Bars still building; by default only those that changed since the last call"""
+        parts = []
+        for label, state in self.state.items():
+            mask = state["is_open"] & (state["dirty"] if dirty_only else True)
+            codes = np.flatnonzero(mask)
+            if len(codes):
+                parts.append((label, codes, state["bucket"][codes], state["bars"][codes]))
+            state["dirty"][:] = False
+        return self._frame(parts)